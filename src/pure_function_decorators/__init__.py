@@ -1,11 +1,17 @@
 """Public package surface for the pure-function-decorators project."""
 
-from typing import Final
+from __future__ import annotations
 
-from .enforce_deterministic import enforce_deterministic
-from .forbid_globals import forbid_globals
-from .forbid_side_effects import forbid_side_effects
-from .immutable_arguments import immutable_arguments
+import importlib
+import sys
+from types import ModuleType
+from typing import TYPE_CHECKING, Final
+
+if TYPE_CHECKING:
+    from .enforce_deterministic import enforce_deterministic
+    from .forbid_globals import forbid_globals
+    from .forbid_side_effects import forbid_side_effects
+    from .immutable_arguments import immutable_arguments
 
 __all__: Final = [
     "enforce_deterministic",
@@ -13,3 +19,75 @@ __all__: Final = [
     "forbid_side_effects",
     "immutable_arguments",
 ]
+_LAZY_NAMES: Final = frozenset(__all__)
+
+
+def __getattr__(name: str) -> object:
+    """Import a decorator from its submodule on first access.
+
+    Parameters
+    ----------
+    name : str
+        The attribute requested from the package.
+
+    Returns:
+    -------
+    object
+        The decorator of that name.
+
+    Raises:
+    ------
+    AttributeError
+        If ``name`` is not one of the public decorators.
+
+    Notes:
+    -----
+    Each decorator lives in a submodule of the same name, so importing one
+    decorator does not pay for the dependencies of the others (``asyncio``
+    for ``enforce_deterministic`` in particular). The decorator is stored in
+    the package namespace; :class:`_Package` keeps it there when the import
+    system binds the submodule of the same name.
+    """
+    if name not in _LAZY_NAMES:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value: object = getattr(importlib.import_module(f".{name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+class _Package(ModuleType):
+    """Package module whose decorators take the place of their submodules."""
+
+    def __setattr__(self, name: str, value: object) -> None:
+        """Bind ``value``, swapping a decorator's submodule for the decorator.
+
+        Parameters
+        ----------
+        name : str
+            The attribute being bound on the package.
+        value : object
+            The value bound; the import system passes each submodule once it
+            has been executed.
+        """
+        if (
+            name in _LAZY_NAMES
+            and isinstance(value, ModuleType)
+            and value.__name__ == f"{__name__}.{name}"
+        ):
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
+
+
+def __dir__() -> list[str]:
+    """List the package attributes, including not yet imported decorators.
+
+    Returns:
+    -------
+    list[str]
+        The sorted attribute names.
+    """
+    return sorted({*globals(), *__all__})
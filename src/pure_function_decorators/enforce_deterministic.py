@@ -3,29 +3,60 @@
 from __future__ import annotations
 
 import asyncio
+import importlib
+import inspect
+import keyword
 import logging
+import os
 import pickle
 import threading
+from collections import OrderedDict
 from functools import wraps
-from typing import TYPE_CHECKING, Final, cast, overload
+from types import FunctionType
+from typing import TYPE_CHECKING, Any, Final, cast, overload
 
 if TYPE_CHECKING:
     from collections.abc import Awaitable, Callable
-_MISSING: Final = object()
+    from types import ModuleType
+
+# Exact types whose equal values always share a type and an identical pickle,
+# so the arguments themselves can serve as a cache key. ``bool`` and
+# ``float`` are excluded because ``True == 1`` and ``0.0 == -0.0``.
+_KEY_ATOMIC_TYPES: Final = frozenset({type(None), int, str, bytes})
+# Separates positional from keyword arguments in flat keys, as in
+# ``functools.lru_cache``; being an ``object`` it can never be an argument.
+_KWD_MARK: Final = object()
 
 _LOGGER = logging.getLogger(__name__)
 
+# Setting ``PURE_FN_ENFORCE=0`` turns the decorator into a no-op so production
+# deployments pay no per-call overhead.
+_DEFAULT_ENABLED: Final = os.environ.get("PURE_FN_ENFORCE", "1") != "0"
+
+
+def _load_msgpack() -> ModuleType | None:
+    """Return the optional ``msgpack`` module if it is installed."""
+    try:
+        return importlib.import_module("msgpack")
+    except ImportError:  # pragma: no cover - depends on the environment
+        return None
+
+
+_MSGPACK: Final = _load_msgpack()
+# ``msgpack`` builds keys for JSON-like arguments several times faster than
+# pickle; pure-stdlib installs keep using pickle.
+_KEY_SERIALIZER: Final = "pickle" if _MSGPACK is None else "msgpack"
+_MSGPACK_LOCAL: Final = threading.local()
+
 
-def _pickle_args(
-    *args: object, **kwargs: object
-) -> bytes:  # pragma: no cover - tiny helper
+def _pickle_args(args: tuple[object, ...], kwargs: dict[str, object]) -> bytes:
     """Serialize positional and keyword arguments into a cache key.
 
     Parameters
     ----------
-    *args : object
+    args : tuple[object, ...]
         Positional arguments supplied to the decorated callable.
-    **kwargs : object
+    kwargs : dict[str, object]
         Keyword arguments supplied to the decorated callable.
 
     Returns:
@@ -33,58 +64,413 @@ def _pickle_args(
     bytes
         A pickle representation that can be used as a dictionary key.
     """
-    return pickle.dumps((args, kwargs))
+    return pickle.dumps((args, kwargs), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _msgpack_args(args: tuple[object, ...], kwargs: dict[str, object]) -> bytes | None:
+    """Serialize arguments with ``msgpack`` when it can represent them exactly.
+
+    Parameters
+    ----------
+    args : tuple[object, ...]
+        Positional arguments supplied to the decorated callable.
+    kwargs : dict[str, object]
+        Keyword arguments supplied to the decorated callable.
+
+    Returns:
+    -------
+    bytes | None
+        The packed arguments, or ``None`` if they contain values ``msgpack``
+        cannot encode without losing type information.
+
+    Notes:
+    -----
+    ``strict_types`` rejects tuples and subclasses instead of encoding them
+    like their base type, so distinct inputs never share a key. Packed keys
+    start with an array marker and cannot collide with pickles, which start
+    with the ``PROTO`` opcode. Each thread reuses its own ``Packer`` because
+    creating one per call costs more than the packing itself.
+    """
+    packer = getattr(_MSGPACK_LOCAL, "packer", None)
+    if packer is None:
+        if _MSGPACK is None:  # pragma: no cover - depends on the environment
+            return None
+        packer = _MSGPACK.Packer(use_bin_type=True, strict_types=True)
+        _MSGPACK_LOCAL.packer = packer
+    try:
+        return cast("bytes", packer.pack([list(args), kwargs]))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def _serialize_args(args: tuple[object, ...], kwargs: dict[str, object]) -> bytes:
+    """Serialize arguments that cannot be used as a cache key directly.
+
+    Parameters
+    ----------
+    args : tuple[object, ...]
+        Positional arguments supplied to the decorated callable.
+    kwargs : dict[str, object]
+        Keyword arguments supplied to the decorated callable.
+
+    Returns:
+    -------
+    bytes
+        The arguments packed by ``msgpack`` when selected and possible,
+        otherwise pickled by :func:`_pickle_args`.
+    """
+    if _KEY_SERIALIZER == "msgpack":
+        packed = _msgpack_args(args, kwargs)
+        if packed is not None:
+            return packed
+    return _pickle_args(args, kwargs)
+
+
+def _is_key_tuple(value: object) -> bool:
+    """Return whether ``value`` is a tuple that can be used inside a key.
+
+    Parameters
+    ----------
+    value : object
+        An argument whose type is not in ``_KEY_ATOMIC_TYPES``.
+
+    Returns:
+    -------
+    bool
+        ``True`` for exact tuples made only of key scalars and such tuples.
+    """
+    if type(value) is not tuple:
+        return False
+    key_types = _KEY_ATOMIC_TYPES
+    return all(
+        type(item) in key_types or _is_key_tuple(item)
+        for item in cast("tuple[object, ...]", value)
+    )
+
+
+def _make_key(args: tuple[object, ...], kwargs: dict[str, object]) -> object:
+    """Build the cache key for a call with the given arguments.
+
+    Parameters
+    ----------
+    args : tuple[object, ...]
+        Positional arguments supplied to the decorated callable.
+    kwargs : dict[str, object]
+        Keyword arguments supplied to the decorated callable.
+
+    Returns:
+    -------
+    object
+        When every argument is a simple scalar or a tuple of them, a flat
+        tuple that is far cheaper to build and hash than a serialization:
+        ``args`` itself for positional-only calls, else ``args`` followed by
+        ``_KWD_MARK`` and the keyword ``(name, value)`` pairs. Otherwise the bytes from
+        :func:`_serialize_args`.
+    """
+    key_types = _KEY_ATOMIC_TYPES
+    for value in args:
+        if type(value) not in key_types and not _is_key_tuple(value):
+            return _serialize_args(args, kwargs)
+    if not kwargs:
+        return args
+    for value in kwargs.values():
+        if type(value) not in key_types and not _is_key_tuple(value):
+            return _serialize_args(args, kwargs)
+    return (*args, _KWD_MARK, *kwargs.items())
+
+
+def _arrays_equal(cached: object, result: object) -> bool:
+    """Return whether two array-like results are equal.
+
+    Parameters
+    ----------
+    cached : object
+        The result remembered for the arguments.
+    result : object
+        The result of the current call, whose comparison with ``cached``
+        could not be truth-tested.
+
+    Returns:
+    -------
+    bool
+        ``True`` if the shapes match and every element compares equal.
+
+    Notes:
+    -----
+    Array types such as NumPy arrays or pandas objects compare elementwise
+    and raise ``ValueError`` when the comparison is used as a boolean.
+    pandas objects are compared with their ``equals`` method instead: ``==``
+    rejects differently labelled frames, and reducing a frame's mask with
+    ``all()`` leaves a ``Series``. Results that cannot be compared at all
+    count as different.
+    """
+    try:
+        equals = getattr(cached, "equals", None)
+        if callable(equals):
+            return bool(equals(result))
+        if getattr(cached, "shape", None) != getattr(result, "shape", None):
+            return False
+        equal: Any = cached == result
+        return bool(equal.all())
+    except (TypeError, ValueError):
+        return False
+
+
+def _raise_divergence(message: str) -> None:
+    """Raise ``ValueError`` for a result that differs from the cached one.
+
+    Parameters
+    ----------
+    message : str
+        The diagnostic describing the divergence.
+
+    Raises:
+    ------
+    ValueError
+        Always.
+    """
+    raise ValueError(message)
+
+
+# Source of a wrapper specialised to ``fn``'s parameters: binding them
+# directly avoids packing ``*args``/``**kwargs`` and lets scalar keys be
+# checked and built inline. Its body mirrors ``_sync_wrapper`` and, with the
+# ``async``/``await`` prefixes filled in, ``_async_wrapper``.
+_WRAPPER_TEMPLATE: Final = """\
+{async_prefix}def {name}({parameters}):
+    if {key_check}:
+        key = {arguments_tuple}
+    else:
+        key = _make_key({arguments_tuple}, {{}})
+    result = {await_prefix}_fn({arguments})
+    cached = _cache.setdefault(key, result)
+    try:
+        diverged = cached is not result and not cached == result
+    except ValueError:
+        diverged = not _arrays_equal(cached, result)
+    if diverged:
+        _on_divergence("Non-deterministic output detected")
+        _cache[key] = result
+{bookkeeping}    return result
+"""
+_LRU_BOOKKEEPING: Final = """\
+    try:
+        _cache.move_to_end(key)
+        if len(_cache) > _maxsize:
+            _cache.popitem(last=False)
+    except KeyError:
+        pass
+"""
+# Identifiers the generated source relies on; parameters using them would
+# shadow them, so such functions keep the generic wrapper.
+_RESERVED_NAMES: Final = frozenset(
+    {
+        "key",
+        "result",
+        "cached",
+        "diverged",
+        "type",
+        "len",
+        "ValueError",
+        "KeyError",
+        "_fn",
+        "_cache",
+        "_maxsize",
+        "_make_key",
+        "_arrays_equal",
+        "_on_divergence",
+        "_key_types",
+        "_defaults",
+    }
+)
+_SPECIALIZABLE_KINDS: Final = frozenset(
+    {
+        inspect.Parameter.POSITIONAL_ONLY,
+        inspect.Parameter.POSITIONAL_OR_KEYWORD,
+        inspect.Parameter.KEYWORD_ONLY,
+    }
+)
 
 
-def _sync_wrapper[**P, T](fn: Callable[P, T], *, strict: bool) -> Callable[P, T]:
+def _specialized_wrapper[**P, T](
+    fn: Callable[P, T],
+    *,
+    cache: OrderedDict[object, Any],
+    on_divergence: Callable[[str], None],
+    maxsize: int | None,
+    is_async: bool = False,
+) -> Callable[P, T] | None:
+    """Generate a wrapper for ``fn`` that takes its parameters directly.
+
+    Parameters
+    ----------
+    fn : Callable[P, T]
+        The callable to wrap.
+    cache : OrderedDict[object, Any]
+        The results remembered for previous calls.
+    on_divergence : Callable[[str], None]
+        Called with a message when a result differs from the cached one.
+    maxsize : int | None
+        The number of most recently used results to remember, or ``None``
+        for no limit.
+    is_async : bool, optional
+        Whether ``fn`` is a coroutine function whose result must be awaited.
+
+    Returns:
+    -------
+    Callable[P, T] | None
+        The generated wrapper, or ``None`` when ``fn`` is not a plain Python
+        function or its signature cannot be inspected or uses variadic
+        parameters.
+
+    Notes:
+    -----
+    The generated wrapper binds every call to the full parameter list, so
+    ``f(1)``, ``f(1, 2)`` and ``f(x=1)`` share a key when they bind the same
+    values. Defaults are taken from the signature, so they are the very
+    objects ``fn`` would receive.
+    """
+    if not isinstance(fn, FunctionType):
+        # Partials, callable instances and builtins may lack ``__name__`` and
+        # bind differently than their signature suggests.
+        return None
+    try:
+        # A ``functools.wraps`` wrapper may accept other parameters than the
+        # function it wraps; the wrapper is what gets called.
+        parameters = list(
+            inspect.signature(fn, follow_wrapped=False).parameters.values()
+        )
+    except (TypeError, ValueError):
+        return None
+    names = [parameter.name for parameter in parameters]
+    if any(parameter.kind not in _SPECIALIZABLE_KINDS for parameter in parameters):
+        return None
+    if not _RESERVED_NAMES.isdisjoint(names):
+        return None
+
+    defaults: list[object] = []
+    rendered: list[str] = []
+    for parameter in parameters:
+        if parameter.default is inspect.Parameter.empty:
+            rendered.append(parameter.name)
+        else:
+            rendered.append(f"{parameter.name}=_defaults[{len(defaults)}]")
+            defaults.append(parameter.default)
+    # Positional-only parameters always come first and keyword-only ones
+    # last, so the markers go between the groups.
+    positional_only = sum(
+        parameter.kind is inspect.Parameter.POSITIONAL_ONLY for parameter in parameters
+    )
+    keyword_only = sum(
+        parameter.kind is inspect.Parameter.KEYWORD_ONLY for parameter in parameters
+    )
+    positional = len(parameters) - keyword_only
+    if keyword_only:
+        rendered.insert(positional, "*")
+    if positional_only:
+        rendered.insert(positional_only, "/")
+
+    wrapper_name = fn.__name__
+    if (
+        not wrapper_name.isidentifier()
+        or keyword.iskeyword(wrapper_name)
+        or wrapper_name in _RESERVED_NAMES
+    ):
+        wrapper_name = "wrapper"
+    arguments_tuple = ", ".join(names)
+    arguments = ", ".join(
+        [*names[:positional], *(f"{name}={name}" for name in names[positional:])]
+    )
+    source = _WRAPPER_TEMPLATE.format(
+        async_prefix="async " if is_async else "",
+        await_prefix="await " if is_async else "",
+        name=wrapper_name,
+        parameters=", ".join(rendered),
+        key_check=" and ".join(f"type({name}) in _key_types" for name in names)
+        or "True",
+        arguments_tuple=f"({arguments_tuple},)" if names else "()",
+        arguments=arguments,
+        bookkeeping="" if maxsize is None else _LRU_BOOKKEEPING,
+    )
+    namespace: dict[str, Any] = {
+        "_fn": fn,
+        "_cache": cache,
+        "_maxsize": maxsize,
+        "_make_key": _make_key,
+        "_arrays_equal": _arrays_equal,
+        "_on_divergence": on_divergence,
+        "_key_types": _KEY_ATOMIC_TYPES,
+        "_defaults": tuple(defaults),
+    }
+    # The source only interpolates parameter names taken from the signature.
+    exec(source, namespace)  # noqa: S102
+    generated = cast("Callable[P, T]", namespace[wrapper_name])
+    return wraps(fn)(generated)
+
+
+def _sync_wrapper[**P, T](
+    fn: Callable[P, T], *, strict: bool, maxsize: int | None
+) -> Callable[P, T]:
     """Wrap ``fn`` with deterministic-result enforcement for sync callables.
 
     Parameters
     ----------
     fn : Callable[P, T]
         The synchronous callable whose outputs should remain stable.
+    strict : bool
+        Whether divergent results raise instead of logging a warning.
+    maxsize : int | None
+        The number of most recently used results to remember, or ``None``
+        for no limit.
 
     Returns:
     -------
     Callable[P, T]
         A wrapped callable that caches results and raises on divergence.
     """
-    cache: dict[bytes, T] = {}
-    lock = threading.RLock()
+    cache: OrderedDict[object, T] = OrderedDict()
+    on_divergence = _raise_divergence if strict else _LOGGER.warning
+    specialized = _specialized_wrapper(
+        fn, cache=cache, on_divergence=on_divergence, maxsize=maxsize
+    )
+    if specialized is not None:
+        return specialized
 
     @wraps(fn)
     def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-        key = _pickle_args(*args, **kwargs)
-        with lock:
-            cached = cache.get(key, _MISSING)
+        # The key must be taken before the call: ``fn`` may mutate its
+        # arguments, and keying on their post-call state would pair the
+        # result with the wrong inputs.
+        key = _make_key(args, kwargs)
         result = fn(*args, **kwargs)
-        if cached is not _MISSING:
-            if cached != result:
-                message = "Non-deterministic output detected"
-                if strict:
-                    raise ValueError(message)
-                _LOGGER.warning(message)
-                with lock:
-                    cache[key] = result
-                return result
-            return result
-        with lock:
-            current = cache.get(key, _MISSING)
-            if current is not _MISSING and current != result:
-                message = "Non-deterministic output detected"
-                if strict:
-                    raise ValueError(message)
-                _LOGGER.warning(message)
-                cache[key] = result
-                return result
+        # No lock: each ``OrderedDict`` operation is atomic under the GIL, and
+        # racing callers either agree on the result or have found a real
+        # divergence. A concurrent eviction can only make the LRU
+        # bookkeeping below miss, which is harmless.
+        cached = cache.setdefault(key, result)
+        try:
+            # ``not`` truth-tests here, inside the ``try``, so array
+            # comparisons that refuse ``bool()`` land in the handler.
+            diverged = cached is not result and not cached == result  # noqa: SIM201
+        except ValueError:
+            diverged = not _arrays_equal(cached, result)
+        if diverged:
+            on_divergence("Non-deterministic output detected")
             cache[key] = result
+        if maxsize is not None:
+            try:
+                cache.move_to_end(key)
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+            except KeyError:  # pragma: no cover - needs a racing eviction
+                pass
         return result
 
     return wrapper
 
 
 def _async_wrapper[**P, AwaitedT](
-    fn: Callable[P, Awaitable[AwaitedT]], *, strict: bool
+    fn: Callable[P, Awaitable[AwaitedT]], *, strict: bool, maxsize: int | None
 ) -> Callable[P, Awaitable[AwaitedT]]:
     """Wrap ``fn`` with deterministic-result enforcement for async callables.
 
@@ -92,41 +478,49 @@ def _async_wrapper[**P, AwaitedT](
     ----------
     fn : Callable[P, Awaitable[AwaitedT]]
         The asynchronous callable whose awaited results must not vary.
+    strict : bool
+        Whether divergent results raise instead of logging a warning.
+    maxsize : int | None
+        The number of most recently used results to remember, or ``None``
+        for no limit.
 
     Returns:
     -------
     Callable[P, Awaitable[AwaitedT]]
         A wrapped coroutine function that caches and validates outcomes.
     """
-    cache: dict[bytes, AwaitedT] = {}
-    lock = asyncio.Lock()
+    cache: OrderedDict[object, AwaitedT] = OrderedDict()
+    on_divergence = _raise_divergence if strict else _LOGGER.warning
+    specialized = _specialized_wrapper(
+        fn,
+        cache=cache,
+        on_divergence=on_divergence,
+        maxsize=maxsize,
+        is_async=True,
+    )
+    if specialized is not None:
+        return specialized
 
     @wraps(fn)
     async def wrapper(*args: P.args, **kwargs: P.kwargs) -> AwaitedT:
-        key = _pickle_args(*args, **kwargs)
-        async with lock:
-            cached = cache.get(key, _MISSING)
+        key = _make_key(args, kwargs)  # taken before the call, as above
         result = await fn(*args, **kwargs)
-        if cached is not _MISSING:
-            if cached != result:
-                message = "Non-deterministic output detected"
-                if strict:
-                    raise ValueError(message)
-                _LOGGER.warning(message)
-                async with lock:
-                    cache[key] = result
-                return result
-            return result
-        async with lock:
-            current = cache.get(key, _MISSING)
-            if current is not _MISSING and current != result:
-                message = "Non-deterministic output detected"
-                if strict:
-                    raise ValueError(message)
-                _LOGGER.warning(message)
-                cache[key] = result
-                return result
+        # Nothing below awaits, so it cannot interleave with other coroutines
+        # on the loop and needs no lock.
+        cached = cache.setdefault(key, result)
+        try:
+            # ``not`` truth-tests here, inside the ``try``, so array
+            # comparisons that refuse ``bool()`` land in the handler.
+            diverged = cached is not result and not cached == result  # noqa: SIM201
+        except ValueError:
+            diverged = not _arrays_equal(cached, result)
+        if diverged:
+            on_divergence("Non-deterministic output detected")
             cache[key] = result
+        if maxsize is not None:
+            cache.move_to_end(key)
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
         return result
 
     return wrapper
@@ -138,7 +532,7 @@ def enforce_deterministic[**P, T](fn: Callable[P, T]) -> Callable[P, T]: ...
 
 @overload
 def enforce_deterministic[**P, T](
-    *, enabled: bool = True, strict: bool = True
+    *, enabled: bool = True, strict: bool = True, maxsize: int | None = 1024
 ) -> Callable[[Callable[P, T]], Callable[P, T]]: ...
 
 
@@ -147,6 +541,7 @@ def enforce_deterministic[**P, T](
     *,
     enabled: bool = True,
     strict: bool = True,
+    maxsize: int | None = 1024,
 ) -> Callable[[Callable[P, T]], Callable[P, T]] | Callable[P, T]:
     """Ensure the callable always returns the same value for identical inputs.
 
@@ -156,27 +551,41 @@ def enforce_deterministic[**P, T](
         The function to wrap. When omitted, the decorator is returned for
         deferred application.
     enabled : bool, optional
-        If ``False`` skip decorating and return ``fn`` unchanged.
+        If ``False`` skip decorating and return ``fn`` unchanged. Decorating is
+        also skipped when the ``PURE_FN_ENFORCE`` environment variable was set
+        to ``0`` at import time.
     strict : bool, optional
         When ``False`` log warnings about non-deterministic behaviour instead of
         raising ``ValueError``.
+    maxsize : int | None, optional
+        How many distinct argument combinations to remember, by default
+        ``1024``. The least recently used results are evicted first, after
+        which a divergent result for those arguments is no longer detected.
+        ``None`` keeps every result.
 
     Returns:
     -------
     Callable
         Either the decorated function or a decorator awaiting a function,
         depending on whether ``fn`` was provided.
+
+    Notes:
+    -----
+    Functions without variadic parameters get a wrapper generated from
+    their signature. It binds arguments the way
+    ``fn`` does, so positional, keyword and defaulted spellings of the same
+    call are checked against each other.
     """
 
     def decorator(func: Callable[P, T]) -> Callable[P, T]:
-        if not enabled:
+        if not enabled or not _DEFAULT_ENABLED:
             return func
         if asyncio.iscoroutinefunction(func):
             async_fn = cast("Callable[P, Awaitable[object]]", func)
-            wrapped = _async_wrapper(async_fn, strict=strict)
+            wrapped = _async_wrapper(async_fn, strict=strict, maxsize=maxsize)
             return cast("Callable[P, T]", wrapped)
 
-        return _sync_wrapper(func, strict=strict)
+        return _sync_wrapper(func, strict=strict, maxsize=maxsize)
 
     if fn is not None:
         return decorator(fn)
@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 import builtins
-import dis
 import inspect
 import logging
+import opcode
+import os
 import types
 from functools import wraps
 from typing import TYPE_CHECKING, Final, cast, overload
@@ -13,32 +14,91 @@ from typing import TYPE_CHECKING, Final, cast, overload
 if TYPE_CHECKING:
     from collections.abc import Awaitable, Callable, Iterable
 
-_GLOBAL_OPS: Final = {"LOAD_GLOBAL", "STORE_GLOBAL", "DELETE_GLOBAL"}
-_IMPORT_OPS: Final = {"IMPORT_NAME"}
+_GLOBAL_OPS: Final = frozenset({"LOAD_GLOBAL", "STORE_GLOBAL", "DELETE_GLOBAL"})
+_IMPORT_OPS: Final = frozenset({"IMPORT_NAME"})
+
+# Opcode numbers are fixed for the running interpreter, so the bytecode can be
+# scanned directly instead of decoding ``dis.Instruction`` objects.
+_LOAD_GLOBAL: Final = opcode.opmap["LOAD_GLOBAL"]
+_STORE_DELETE_OPCODES: Final = frozenset(
+    opcode.opmap[name] for name in _GLOBAL_OPS - {"LOAD_GLOBAL"}
+)
+_IMPORT_OPCODES: Final = frozenset(opcode.opmap[name] for name in _IMPORT_OPS)
+_EXTENDED_ARG: Final = opcode.EXTENDED_ARG
+# ``CodeType`` cannot be subclassed, so an identity test on the type suffices.
+_CODE_TYPE: Final = types.CodeType
+# Opcodes to report, keyed by ``(include_store_delete, include_imports)``.
+_REPORTED_OPCODES: Final[dict[tuple[bool, bool], frozenset[int]]] = {
+    (store_delete, imports): frozenset(
+        {_LOAD_GLOBAL}
+        | (_STORE_DELETE_OPCODES if store_delete else frozenset())
+        | (_IMPORT_OPCODES if imports else frozenset())
+    )
+    for store_delete in (False, True)
+    for imports in (False, True)
+}
+
+_BUILTIN_NAMES: Final = frozenset(builtins.__dict__)
+# Builtins through which a function can write to its own globals.
+_GLOBALS_WRITERS: Final = frozenset({"globals", "exec", "eval"})
+# Names, global or attribute, through which code can reach a frame and so its
+# globals (``sys._getframe().f_globals``, ``inspect.currentframe()``, ...).
+_FRAME_NAMES: Final = frozenset(
+    {
+        "sys",
+        "inspect",
+        "_getframe",
+        "currentframe",
+        "f_back",
+        "f_globals",
+        "__globals__",
+        "cr_frame",
+        "gi_frame",
+        "tb_frame",
+    }
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Setting ``PURE_FN_ENFORCE=0`` turns the decorator into a no-op so production
+# deployments pay no per-call overhead.
+_DEFAULT_ENABLED: Final = os.environ.get("PURE_FN_ENFORCE", "1") != "0"
 
-def _build_minimal_globals(
+
+def _sandbox_factory(
     fn: Callable[..., object], allow: tuple[str, ...]
-) -> dict[str, object]:
-    """Return a globals mapping limited to the provided allow-list.
+) -> tuple[Callable[[], Callable[..., object]], Callable[..., object] | None]:
+    """Return a callable that clones ``fn`` with globals limited to ``allow``.
 
     Parameters
     ----------
     fn : Callable[P, T]
-        The function whose globals should be mirrored.
+        The function whose code should run inside the sandbox.
     allow : tuple[str, ...]
         Names that remain accessible to the cloned function.
 
     Returns:
     -------
-    dict[str, object]
-        A globals dictionary containing only the whitelisted names and
-        essential module metadata.
+    tuple[Callable[[], Callable[P, T]], Callable[P, T] | None]
+        A builder returning the clone of ``fn`` to run for the current call,
+        with the allowed names read from the module at call time, and the
+        clone itself when no call ever needs a different one.
+
+    Notes:
+    -----
+    Everything that does not change between calls (the code object,
+    defaults, closure and the module dunders of the globals) is gathered
+    once. When ``fn`` cannot write to its globals, a single clone
+    and globals dictionary are shared by all calls and only the allowed
+    names are refreshed; with nothing to refresh, that clone can be called
+    directly. Otherwise every call gets its own clone and
+    dictionary, so that writes made during one call never leak into another
+    and concurrent calls stay isolated. A call also gets its own clone while
+    an allowed name is bound to a callable, which may write through an alias
+    of ``globals`` or the caller's frame.
     """
     source_globals = fn.__globals__
-    minimal: dict[str, object] = {
+    template: dict[str, object] = {
         "__builtins__": source_globals.get("__builtins__", __builtins__),
         "__name__": source_globals.get("__name__", fn.__module__),
         "__package__": source_globals.get("__package__"),
@@ -47,43 +107,76 @@ def _build_minimal_globals(
         "__file__": source_globals.get("__file__"),
         "__cached__": source_globals.get("__cached__"),
     }
-    for name in allow:
-        if name in source_globals:
-            minimal[name] = source_globals[name]
-    return minimal
-
-
-def _make_sandboxed(
-    fn: Callable[..., object], minimal: dict[str, object]
-) -> Callable[..., object]:
-    """Create a clone of ``fn`` that uses ``minimal`` as its globals mapping.
+    code = fn.__code__
+    name = fn.__name__
+    defaults = fn.__defaults__
+    closure = fn.__closure__
+    kwdefaults = getattr(fn, "__kwdefaults__", None)
+    # The clone itself is bound under its own name to support recursion.
+    refreshed = tuple(allowed for allowed in allow if allowed != name)
+
+    def clone() -> Callable[..., object]:
+        minimal = template.copy()
+        for allowed in refreshed:
+            if allowed in source_globals:
+                minimal[allowed] = source_globals[allowed]
+        # ``__module__``, ``__qualname__`` and ``__doc__`` are derived from
+        # the sandbox globals and the code object; only the keyword-only
+        # defaults must be carried over. Callers see the metadata on the
+        # ``wraps``-decorated wrapper, not on the clone.
+        sandboxed = types.FunctionType(code, minimal, name, defaults, closure)
+        sandboxed.__kwdefaults__ = kwdefaults
+        minimal[name] = sandboxed
+        return sandboxed
+
+    if _may_write_globals(code):
+        return clone, None
+
+    shared = clone()
+    shared_globals = shared.__globals__
+
+    def refresh() -> Callable[..., object]:
+        for allowed in refreshed:
+            if allowed in source_globals:
+                value = source_globals[allowed]
+                if callable(value):
+                    return clone()
+                shared_globals[allowed] = value
+            else:
+                shared_globals.pop(allowed, None)
+        return shared
+
+    return refresh, None if refreshed else shared
+
+
+def _may_write_globals(code: types.CodeType) -> bool:
+    """Return whether ``code`` or nested code can modify its globals.
 
     Parameters
     ----------
-    fn : Callable[P, T]
-        The function to clone with restricted globals.
-    minimal : dict[str, object]
-        The globals dictionary the clone should operate with.
+    code : types.CodeType
+        The code object to analyze.
 
     Returns:
     -------
-    Callable[P, T]
-        A function object that executes ``fn``'s code inside the sandbox.
+    bool
+        ``True`` if any ``STORE_GLOBAL``/``DELETE_GLOBAL`` instruction is
+        present, if ``globals``, ``exec`` or ``eval`` are referenced, or if
+        any name through which frames can be reached is used.
     """
-    sandboxed = types.FunctionType(
-        fn.__code__,
-        minimal,
-        fn.__name__,
-        fn.__defaults__,
-        fn.__closure__,
+    pending = [code]
+    while pending:
+        current = pending.pop()
+        # Even bytes are opcodes; inline caches are whole ``CACHE`` units.
+        if not _STORE_DELETE_OPCODES.isdisjoint(current.co_code[::2]):
+            return True
+        if not _FRAME_NAMES.isdisjoint(current.co_names):
+            return True
+        pending += [const for const in current.co_consts if type(const) is _CODE_TYPE]
+    loaded = _collect_global_names(
+        code, include_store_delete=False, include_imports=False
     )
-    sandboxed.__module__ = fn.__module__
-    sandboxed.__doc__ = fn.__doc__
-    sandboxed.__qualname__ = fn.__qualname__
-    sandboxed.__kwdefaults__ = getattr(fn, "__kwdefaults__", None)
-    sandboxed.__annotations__ = getattr(fn, "__annotations__", {}).copy()
-    minimal[fn.__name__] = sandboxed
-    return cast("Callable[..., object]", sandboxed)
+    return not _GLOBALS_WRITERS.isdisjoint(loaded)
 
 
 def _collect_global_names(
@@ -91,7 +184,7 @@ def _collect_global_names(
     include_store_delete: bool = True,
     include_imports: bool = True,
 ) -> set[str]:
-    """Recursively collect global-like names referenced by ``code``.
+    """Collect global-like names referenced by ``code`` and nested code.
 
     Parameters
     ----------
@@ -109,19 +202,34 @@ def _collect_global_names(
     set[str]
         All global names referenced by the code object and its nested
         constants.
-    """
-    ops = {"LOAD_GLOBAL"}
-    if include_store_delete:
-        ops |= _GLOBAL_OPS - {"LOAD_GLOBAL"}
 
+    Notes:
+    -----
+    Nested code objects (functions, lambdas, comprehensions, classes) are
+    visited from a worklist in a single frame, so deeply nested definitions
+    cannot hit the recursion limit.
+    """
+    ops = _REPORTED_OPCODES[bool(include_store_delete), bool(include_imports)]
     names: set[str] = set()
-    for ins in dis.get_instructions(code):
-        if ins.opname in ops or (include_imports and ins.opname in _IMPORT_OPS):
-            names.add(ins.argval)
-
-    for const in code.co_consts:
-        if isinstance(const, types.CodeType):
-            names |= _collect_global_names(const, include_store_delete, include_imports)
+    pending = [code]
+    while pending:
+        current = pending.pop()
+        co_code = current.co_code
+        co_names = current.co_names
+        extended = 0
+        # Every instruction (inline caches included) is an opcode byte
+        # followed by an argument byte; ``EXTENDED_ARG`` prefixes supply the
+        # high bits.
+        for op, low in zip(co_code[::2], co_code[1::2], strict=True):
+            if op == _EXTENDED_ARG:
+                extended = (extended | low) << 8
+                continue
+            arg = extended | low
+            extended = 0
+            if op in ops:
+                # The low bit of ``LOAD_GLOBAL``'s argument flags a NULL push.
+                names.add(co_names[arg >> 1 if op == _LOAD_GLOBAL else arg])
+        pending += [const for const in current.co_consts if type(const) is _CODE_TYPE]
 
     return names
 
@@ -190,7 +298,9 @@ def forbid_globals[**P, T](
     check_names : bool, optional
         When ``True`` statically inspect the function for disallowed names.
     enabled : bool, optional
-        If ``False`` skip decorating and return ``fn`` unchanged.
+        If ``False`` skip decorating and return ``fn`` unchanged. Decorating is
+        also skipped when the ``PURE_FN_ENFORCE`` environment variable was set
+        to ``0`` at import time.
     strict : bool, optional
         When ``False`` log warnings instead of raising ``RuntimeError`` during
         name checking.
@@ -207,12 +317,12 @@ def forbid_globals[**P, T](
         If ``check_names`` is enabled and a disallowed global is detected.
     """
     allowed_tuple = tuple(allow)
-    allowed_set = set(allowed_tuple)
+    allowed_set = frozenset(allowed_tuple)
     if check_names and allow_builtins:
-        allowed_set |= set(builtins.__dict__.keys())
+        allowed_set = allowed_set | _BUILTIN_NAMES if allowed_set else _BUILTIN_NAMES
 
     def decorator(fn: Callable[P, T]) -> Callable[P, T]:
-        if not enabled:
+        if not enabled or not _DEFAULT_ENABLED:
             return fn
         if check_names:
             used = _collect_global_names(
@@ -231,28 +341,26 @@ def forbid_globals[**P, T](
         if not sandbox:
             return fn
 
+        build, fixed = _sandbox_factory(fn, allowed_tuple)
+        if fixed is not None:
+            # The clone is a coroutine function whenever ``fn`` is one, so it
+            # can stand in for the wrapper and save a frame per call.
+            return cast("Callable[P, T]", wraps(fn)(fixed))
+
         if inspect.iscoroutinefunction(fn):
-            async_fn = cast("Callable[P, Awaitable[object]]", fn)
+            build_async = cast("Callable[[], Callable[P, Awaitable[object]]]", build)
 
             @wraps(fn)
             async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> object:
-                sandboxed = cast(
-                    "Callable[P, Awaitable[object]]",
-                    _make_sandboxed(
-                        async_fn, _build_minimal_globals(async_fn, allowed_tuple)
-                    ),
-                )
-                return await sandboxed(*args, **kwargs)
+                return await build_async()(*args, **kwargs)
 
             return cast("Callable[P, T]", async_wrapper)
 
+        build_sync = cast("Callable[[], Callable[P, T]]", build)
+
         @wraps(fn)
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-            sandboxed = cast(
-                "Callable[P, T]",
-                _make_sandboxed(fn, _build_minimal_globals(fn, allowed_tuple)),
-            )
-            return sandboxed(*args, **kwargs)
+            return build_sync()(*args, **kwargs)
 
         return wrapper
 
@@ -14,37 +14,124 @@ import multiprocessing
 import os
 import random
 import secrets
-import socket
-import subprocess
 import sys
 import threading
 import time
 import uuid
 import warnings
-from contextlib import suppress
-from functools import wraps
-from collections.abc import Awaitable, Callable, Iterator, MutableMapping
+import weakref
+from collections.abc import MutableMapping
+from contextlib import nullcontext, suppress
+from contextvars import ContextVar
+from functools import cache, wraps
 from typing import (
+    TYPE_CHECKING,
+    Any,
     Final,
     NoReturn,
-    Protocol,
     Self,
     TypeVar,
     cast,
     overload,
     override,
-    runtime_checkable,
 )
 
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterator
+    from contextvars import Token
+
 _LOGGER = logging.getLogger(__name__)
 
+# Setting ``PURE_FN_ENFORCE=0`` turns the decorator into a no-op so production
+# deployments pay no per-call overhead.
+_DEFAULT_ENABLED: Final = os.environ.get("PURE_FN_ENFORCE", "1") != "0"
+
 
 class _HybridRLock:
-    """Lock usable as both sync and async context manager."""
+    """Lock usable as both sync and async context manager.
+
+    Notes:
+    -----
+    Mutual exclusion comes from a plain ``threading.Lock``, which, unlike an
+    ``RLock``, may be released by a thread other than the one that acquired
+    it. Re-entry is tracked per thread on top of it, so a thread, including
+    an event loop thread whose coroutine holds the lock, can nest decorated
+    calls. Coroutines first queue on an ``asyncio.Lock`` for their loop, so
+    that only one of them at a time contends for the thread lock, and only
+    fall back to a blocking acquire in the default executor when another
+    thread holds it.
+    """
+
+    __slots__ = ("_depth", "_lock", "_loop_locks", "_owner")
 
     def __init__(self) -> None:
-        """Initialize the underlying re-entrant lock."""
-        self._lock: threading.RLock = threading.RLock()
+        """Initialize the underlying locks and ownership bookkeeping."""
+        self._lock: threading.Lock = threading.Lock()
+        self._owner: int | None = None
+        self._depth: int = 0
+        self._loop_locks: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Lock
+        ] = weakref.WeakKeyDictionary()
+
+    def _enter_owned(self) -> bool:
+        """Re-enter the lock if the current thread already holds it.
+
+        Returns:
+        -------
+        bool
+            ``True`` if the current thread owns the lock and the nesting
+            depth was incremented.
+        """
+        if self._owner == threading.get_ident():
+            self._depth += 1
+            return True
+        return False
+
+    def _claim(self) -> None:
+        """Record the current thread as owner after acquiring ``_lock``."""
+        self._owner = threading.get_ident()
+        self._depth = 1
+
+    def _leave(self) -> None:
+        """Undo one level of nesting, releasing ``_lock`` at the outermost."""
+        self._depth -= 1
+        if not self._depth:
+            self._owner = None
+            self._lock.release()
+
+    async def _acquire_in_executor(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Block on ``_lock`` in the default executor without stalling ``loop``.
+
+        Parameters
+        ----------
+        loop : asyncio.AbstractEventLoop
+            The running event loop.
+
+        Notes:
+        -----
+        Cancelling the caller does not stop the executor thread, so a lock it
+        acquires after the caller has given up is released straight away.
+        """
+        guard = threading.Lock()
+        acquired = abandoned = False
+
+        def acquire() -> None:
+            nonlocal acquired
+            self._lock.acquire()
+            with guard:
+                if abandoned:
+                    self._lock.release()
+                else:
+                    acquired = True
+
+        try:
+            await loop.run_in_executor(None, acquire)
+        except BaseException:
+            with guard:
+                abandoned = True
+                if acquired:
+                    self._lock.release()
+            raise
 
     def __enter__(self) -> Self:
         """Acquire the lock for use in a synchronous ``with`` block.
@@ -54,12 +141,14 @@ class _HybridRLock:
         _HybridRLock
             The lock instance, matching the context manager protocol.
         """
-        self._lock.acquire()
+        if not self._enter_owned():
+            self._lock.acquire()
+            self._claim()
         return self
 
     def __exit__(self, *_exc: object) -> None:
         """Release the lock on exit from a synchronous ``with`` block."""
-        self._lock.release()
+        self._leave()
 
     async def __aenter__(self) -> Self:
         """Acquire the lock for use in an ``async with`` block.
@@ -70,28 +159,100 @@ class _HybridRLock:
             The lock instance, matching the async context manager protocol.
         """
         loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, self._lock.acquire)
+        loop_lock = self._loop_locks.get(loop)
+        if loop_lock is None:
+            loop_lock = self._loop_locks.setdefault(loop, asyncio.Lock())
+        await loop_lock.acquire()
+        try:
+            if not self._enter_owned():
+                if not self._lock.acquire(blocking=False):
+                    await self._acquire_in_executor(loop)
+                self._claim()
+        except BaseException:
+            loop_lock.release()
+            raise
         return self
 
     async def __aexit__(self, *_exc: object) -> None:
         """Release the lock on exit from an ``async with`` block."""
-        self._lock.release()
+        self._leave()
+        self._loop_locks[asyncio.get_running_loop()].release()
+
+
+class _Activation:
+    """A running decorated call whose traps are installed."""
+
+    __slots__ = ("enclosing", "live", "strict")
+
+    def __init__(self, strict: bool, enclosing: _Activation | None) -> None:
+        """Record a call that has just patched over ``enclosing``'s traps."""
+        self.strict: bool = strict
+        self.enclosing: _Activation | None = enclosing
+        self.live: bool = True
 
 
 _SIDE_EFFECT_LOCK: Final = _HybridRLock()
+# The innermost decorated call running in the current thread or task, or
+# ``None`` outside of one. Asyncio tasks created during a call, and code run
+# through ``copy_context().run`` (``asyncio.to_thread``, for one), inherit it
+# with their copied context, so it only counts while the call is ``live``.
+# Plain ``threading.Thread``s start with it unset.
+_ACTIVE_CALL: Final[ContextVar[_Activation | None]] = ContextVar(
+    "_ACTIVE_CALL", default=None
+)
 
 
-def _emit_warning(message: str) -> None:
-    """Write warnings to the original stderr stream."""
+def _enclosing_call() -> _Activation | None:
+    """Return the decorated call the current thread or task is nested in.
+
+    Returns:
+    -------
+    _Activation | None
+        The call recorded in ``_ACTIVE_CALL`` if it is still running and the
+        current thread holds ``_SIDE_EFFECT_LOCK`` for it, otherwise ``None``.
+    """
+    activation = _ACTIVE_CALL.get()
+    if (
+        activation is not None
+        and activation.live
+        and _SIDE_EFFECT_LOCK._owner == threading.get_ident()
+    ):
+        return activation
+    return None
+
+
+# The innermost call whose traps are installed, or ``None``. Only the thread
+# holding ``_SIDE_EFFECT_LOCK`` reads or replaces it.
+_installed: _Activation | None = None
+
+
+def _stderr_fileno() -> int | None:
+    """Return the file descriptor behind the original stderr stream, if any."""
     stderr = sys.__stderr__
     if stderr is None:  # pragma: no cover - depends on interpreter configuration
+        return None
+    try:
+        return stderr.fileno()
+    except (AttributeError, OSError, ValueError):  # pragma: no cover - embedded
+        return None
+
+
+# Warnings go straight to the descriptor with ``os.write``, which is never
+# patched, so they bypass any stream or ``warnings`` interception and buffering.
+_STDERR_FD: Final = _stderr_fileno()
+
+
+def _emit_warning(message: str) -> None:
+    """Write warnings to the original stderr file descriptor."""
+    # Narrowed through a local: mypyc miscompiles narrowing the ``Final`` itself.
+    fd = _STDERR_FD
+    if fd is None:  # pragma: no cover - depends on interpreter configuration
         _LOGGER.warning("%s", message)
         return
 
     try:
-        stderr.write(f"{message}\n")
-        stderr.flush()
-    except Exception:  # pragma: no cover - defensive fallback
+        os.write(fd, f"{message}\n".encode())
+    except OSError:  # pragma: no cover - defensive fallback
         _LOGGER.exception("Failed to write warning to stderr: %s", message)
 
 
@@ -127,23 +288,11 @@ def _trap(
     return _handler
 
 
-@runtime_checkable
-class _SupportsWrite(Protocol):
-    """Protocol for objects that expose a ``write`` method."""
-
-    def write(self, *args: object, **kwargs: object) -> object: ...
-
-
-@runtime_checkable
-class _SupportsFlush(Protocol):
-    """Protocol for objects that expose a ``flush`` method."""
-
-    def flush(self) -> object: ...
-
-
 class _TrapStdIO:
     """File-like object that reacts to writes to stdout/stderr."""
 
+    __slots__ = ("_original", "_strict")
+
     def __init__(
         self,
         *,
@@ -163,16 +312,18 @@ class _TrapStdIO:
         if self._strict:
             raise RuntimeError(message)
         _emit_warning(message)
-        original = self._original
-        if original is not None and isinstance(original, _SupportsWrite):
-            return original.write(*args, **kwargs)
+        # Plain attribute lookups rather than runtime-checkable protocols, which
+        # mypyc cannot compile.
+        write = getattr(self._original, "write", None)
+        if write is not None:
+            return cast("object", write(*args, **kwargs))
         return None
 
     def flush(self) -> object | None:
         """Provide a harmless flush implementation for callers that expect one."""
-        original = self._original
-        if original is not None and isinstance(original, _SupportsFlush):
-            return original.flush()
+        flush = getattr(self._original, "flush", None)
+        if flush is not None:
+            return cast("object", flush())
         return None
 
     def __getattr__(self, item: str) -> object:
@@ -188,6 +339,8 @@ _T = TypeVar("_T")
 class _TrapEnviron(MutableMapping[str, str]):
     """Proxy object that enforces side-effect policy for ``os.environ``."""
 
+    __slots__ = ("_original", "_strict")
+
     def __init__(self, *, strict: bool, original: MutableMapping[str, str]) -> None:
         self._strict: bool
         self._original: MutableMapping[str, str]
@@ -249,51 +402,269 @@ class _TrapEnviron(MutableMapping[str, str]):
         return default
 
 
-def _make_datetime_proxy(*, strict: bool) -> type[datetime.datetime]:
-    """Create a ``datetime.datetime`` subclass that enforces policy."""
+class _TrapDateTime(datetime.datetime):
+    """``datetime.datetime`` replacement that rejects reading the clock."""
+
+    @override
+    @classmethod
+    def now(cls, tz: datetime.tzinfo | None = None) -> NoReturn:
+        raise RuntimeError("Side effect blocked: datetime.now")
+
+    @override
+    @classmethod
+    def utcnow(cls) -> NoReturn:
+        raise RuntimeError("Side effect blocked: datetime.utcnow")
+
+    @override
+    @classmethod
+    def today(cls) -> NoReturn:
+        raise RuntimeError("Side effect blocked: datetime.today")
+
+
+class _WarnDateTime(datetime.datetime):
+    """``datetime.datetime`` replacement that warns before reading the clock."""
+
+    @override
+    @classmethod
+    def now(cls, tz: datetime.tzinfo | None = None) -> _WarnDateTime:
+        _emit_warning("Side effect blocked: datetime.now")
+        return super().now(tz) if tz is not None else super().now()
+
+    @override
+    @classmethod
+    def utcnow(cls) -> _WarnDateTime:
+        _emit_warning("Side effect blocked: datetime.utcnow")
+        return super().now(datetime.UTC)
+
+    @override
+    @classmethod
+    def today(cls) -> _WarnDateTime:
+        _emit_warning("Side effect blocked: datetime.today")
+        return super().today()
+
+
+# Callables replaced by traps while a decorated function runs, as
+# ``(owner, attribute, description)``. The owners are resolved once at import;
+# the originals are read on every call so later monkeypatches are respected.
+_CALLABLE_TARGETS: Final[tuple[tuple[object, str, str], ...]] = (
+    (builtins, "print", "print"),
+    (builtins, "open", "open"),
+    (random, "random", "random.random"),
+    (random, "randint", "random.randint"),
+    (random, "randrange", "random.randrange"),
+    (random, "choice", "random.choice"),
+    (random, "shuffle", "random.shuffle"),
+    (secrets, "token_bytes", "secrets.token_bytes"),
+    (secrets, "token_hex", "secrets.token_hex"),
+    (secrets, "token_urlsafe", "secrets.token_urlsafe"),
+    (os, "urandom", "os.urandom"),
+    (uuid, "uuid4", "uuid.uuid4"),
+    (time, "time", "time.time"),
+    (time, "sleep", "time.sleep"),
+    (time, "monotonic", "time.monotonic"),
+    (time, "perf_counter", "time.perf_counter"),
+    (os, "getenv", "os.getenv"),
+    (os, "_exit", "os._exit"),
+    (sys, "exit", "sys.exit"),
+    (threading.Thread, "start", "threading.Thread.start"),
+    (multiprocessing.Process, "start", "multiprocessing.Process.start"),
+    (futures.ThreadPoolExecutor, "__init__", "ThreadPoolExecutor.__init__"),
+    (futures.ProcessPoolExecutor, "__init__", "ProcessPoolExecutor.__init__"),
+    (logging.Logger, "_log", "logging"),
+    (warnings, "warn", "warnings.warn"),
+    (atexit, "register", "atexit.register"),
+)
+# Side effects the interpreter raises audit events for (PEP 578), mapped to the
+# description reported. They are caught by ``_audit_hook`` instead of being
+# patched, which also covers references captured before the decorated call.
+# ``os.popen`` and every ``subprocess`` helper go through ``subprocess.Popen``.
+_AUDITED_EVENTS: Final[dict[str, str]] = {
+    "os.system": "os.system",
+    "subprocess.Popen": "subprocess.Popen",
+    "socket.__new__": "socket.socket",
+    "sqlite3.connect": "sqlite3.connect",
+}
+_audit_hook_installed = False
+
+
+def _audit_hook(event: str, _args: tuple[object, ...]) -> None:
+    """React to audited side effects raised while a decorated call runs."""
+    name = _AUDITED_EVENTS.get(event)
+    if name is None:
+        return
+    activation = _ACTIVE_CALL.get()
+    if activation is None or not activation.live:
+        return
+    message = f"Side effect blocked: {name}"
+    if activation.strict:
+        raise RuntimeError(message)
+    _emit_warning(message)
+
+
+def _install_audit_hook() -> None:
+    """Register ``_audit_hook`` the first time a function is decorated.
+
+    Notes:
+    -----
+    Audit hooks cannot be removed, so the hook stays registered for the life
+    of the process and ignores events raised outside decorated calls.
+    """
+    global _audit_hook_installed
+    if not _audit_hook_installed:
+        sys.addaudithook(_audit_hook)
+        _audit_hook_installed = True
+
+
+# Targets patched on every call, as ``(owner, attribute, description)``: the
+# callable targets followed by ``datetime.datetime``.
+_PATCH_TARGETS: Final[tuple[tuple[object, str, str], ...]] = (
+    *_CALLABLE_TARGETS,
+    (datetime, "datetime", "datetime"),
+)
+
+# Originals replaced by the warn-only call currently running, parallel to
+# ``_PATCH_TARGETS``. Warn-only traps are only installed while no other traps
+# are (any call reusing them runs under the installed ones instead), so these
+# are always the real attributes and one list suffices.
+_RELAXED_ORIGINALS: Final[list[object]] = []
+
+
+def _relaxed_trap(name: str, index: int) -> Callable[..., object]:
+    """Return a warn-only trap that forwards to ``_RELAXED_ORIGINALS[index]``.
+
+    Parameters
+    ----------
+    name : str
+        Human-readable description of the blocked operation.
+    index : int
+        Position of the patched attribute in ``_PATCH_TARGETS``.
+
+    Returns:
+    -------
+    Callable[..., object]
+        A function that warns and then calls the original it replaced.
+    """
+
+    def _handler(*args: object, **kwargs: object) -> object:
+        _emit_warning(f"Side effect blocked: {name}")
+        original = cast("Callable[..., object]", _RELAXED_ORIGINALS[index])
+        return original(*args, **kwargs)
+
+    return _handler
+
+
+def _replacement(strict: bool, index: int) -> object:
+    """Return what replaces ``_PATCH_TARGETS[index]`` for the given strictness."""
+    owner, _attr, name = _PATCH_TARGETS[index]
+    if owner is datetime:
+        return _TrapDateTime if strict else _WarnDateTime
     if strict:
+        return _trap(name, strict=True)
+    return _relaxed_trap(name, index)
+
 
-        class _TrapDateTime(datetime.datetime):
-            @override
-            @classmethod
-            def now(cls, tz: datetime.tzinfo | None = None) -> NoReturn:
-                raise RuntimeError("Side effect blocked: datetime.now")
+# Straight-line bodies for swapping every ``_PATCH_TARGETS`` attribute in and
+# out: one attribute load or store per target and no loop. ``{targets}`` lists
+# ``_tN.attribute`` for each target.
+_APPLY_TEMPLATE: Final = """
+def apply():
+    saved = ({targets},)
+    {targets}, = _replacements
+    return saved
 
-            @override
-            @classmethod
-            def utcnow(cls) -> NoReturn:
-                raise RuntimeError("Side effect blocked: datetime.utcnow")
 
-            @override
-            @classmethod
-            def today(cls) -> NoReturn:
-                raise RuntimeError("Side effect blocked: datetime.today")
+def restore(saved):
+    {targets}, = saved
+"""
+
+
+def _compile_patchers() -> tuple[
+    dict[bool, Callable[[], tuple[object, ...]]],
+    Callable[[tuple[object, ...]], None],
+]:
+    """Generate the functions that apply and undo the per-call patches.
+
+    Returns:
+    -------
+    tuple[dict[bool, Callable[[], tuple[object, ...]]], Callable]
+        For each strictness, a function installing its replacements and
+        returning the originals, parallel to ``_PATCH_TARGETS``; and a
+        function putting such originals back.
+    """
+    source = _APPLY_TEMPLATE.format(
+        targets=", ".join(
+            f"_t{index}.{attr}"
+            for index, (_owner, attr, _name) in enumerate(_PATCH_TARGETS)
+        )
+    )
+    owners = {
+        f"_t{index}": owner
+        for index, (owner, _attr, _name) in enumerate(_PATCH_TARGETS)
+    }
+    namespaces: dict[bool, dict[str, Any]] = {}
+    for strict in (True, False):
+        namespaces[strict] = {
+            **owners,
+            "_replacements": tuple(
+                _replacement(strict, index) for index in range(len(_PATCH_TARGETS))
+            ),
+        }
+        # The source only interpolates the constant attribute names above.
+        exec(source, namespaces[strict])  # noqa: S102
+    apply = {strict: namespace["apply"] for strict, namespace in namespaces.items()}
+    return apply, namespaces[True]["restore"]
+
+
+_APPLY_FIXED, _RESTORE_FIXED = _compile_patchers()
+
+# Stand-ins for ``os.environ``, ``sys.stdout`` and ``sys.stderr``, built once per
+# strictness; each call points them at the objects they replace.
+_VALUE_TRAPS: Final = {
+    strict: (
+        _TrapEnviron(strict=strict, original=os.environ),
+        _TrapStdIO(strict=strict),
+        _TrapStdIO(strict=strict),
+    )
+    for strict in (True, False)
+}
+
+# Callables of optional database and HTTP modules trapped like
+# ``_CALLABLE_TARGETS``, as ``(module, attribute, description)``. Not
+# ``Final``: mypyc would inline it, and the tests replace it.
+_OPTIONAL_TARGETS: tuple[tuple[str, str, str], ...] = (
+    ("psycopg2", "connect", "psycopg2.connect"),
+    ("mysql.connector", "connect", "mysql.connector.connect"),
+    ("http.client", "HTTPConnection", "http.client.HTTPConnection"),
+    ("http.client", "HTTPSConnection", "http.client.HTTPSConnection"),
+)
 
-        return _TrapDateTime
 
-    class _WarnDateTime(datetime.datetime):
-        @override
-        @classmethod
-        def now(cls, tz: datetime.tzinfo | None = None) -> _WarnDateTime:
-            _emit_warning("Side effect blocked: datetime.now")
-            return super().now(tz) if tz is not None else super().now()
+@cache
+def _optional_targets() -> tuple[tuple[object, str, str], ...]:
+    """Import the modules behind ``_OPTIONAL_TARGETS`` once.
 
-        @override
-        @classmethod
-        def utcnow(cls) -> _WarnDateTime:
-            _emit_warning("Side effect blocked: datetime.utcnow")
-            return super().now(datetime.UTC)
+    Returns:
+    -------
+    tuple[tuple[object, str, str], ...]
+        ``(module, attribute, description)`` for every optional target whose
+        module could be imported.
+
+    Notes:
+    -----
+    Resolved on the first decorated call rather than at import, so importing
+    this module does not import the database drivers.
+    """
+    targets: list[tuple[object, str, str]] = []
+    for module_name, attr, name in _OPTIONAL_TARGETS:
+        with suppress(Exception):
+            targets.append((importlib.import_module(module_name), attr, name))
+    return tuple(targets)
 
-        @override
-        @classmethod
-        def today(cls) -> _WarnDateTime:
-            _emit_warning("Side effect blocked: datetime.today")
-            return super().today()
 
-    return _WarnDateTime
+_Patches = tuple[tuple[object, ...], list[tuple[object, str, object]]]
 
 
-def _apply_patches(strict: bool) -> list[tuple[object, str, object]]:
+def _apply_patches(strict: bool) -> _Patches:
     """Monkeypatch common side-effect primitives with trapping functions.
 
     Parameters
@@ -303,10 +674,19 @@ def _apply_patches(strict: bool) -> list[tuple[object, str, object]]:
 
     Returns:
     -------
-    list[tuple[object, str, object]]
-        Triples describing each patch so it can be undone later.
+    tuple[tuple[object, ...], list[tuple[object, str, object]]]
+        The originals replaced, parallel to ``_PATCH_TARGETS``, and
+        ``(owner, attribute, original)`` triples for the patches that are only
+        applied when needed, so both can be undone later.
     """
-    patches: list[tuple[object, str, object]] = []
+    # Resolved before any trap is installed: a driver import that reads the
+    # clock or the environment would otherwise fail, and stay unresolved.
+    optional_targets = _optional_targets()
+    originals = _APPLY_FIXED[strict]()
+    if not strict:
+        _RELAXED_ORIGINALS[:] = originals
+
+    extra: list[tuple[object, str, object]] = []
 
     def patch_callable(obj: object, attr: str, name: str) -> None:
         original = getattr(obj, attr)
@@ -316,116 +696,83 @@ def _apply_patches(strict: bool) -> list[tuple[object, str, object]]:
             original=None if strict else cast("Callable[..., object]", original),
         )
         setattr(obj, attr, replacement)
-        patches.append((obj, attr, original))
-
-    def patch_value(
-        obj: object, attr: str, factory: Callable[[object], object]
-    ) -> None:
-        original = getattr(obj, attr)
-        setattr(obj, attr, factory(original))
-        patches.append((obj, attr, original))
-
-    for func_obj, attr, name in (
-        (builtins, "print", "print"),
-        (builtins, "open", "open"),
-        (random, "random", "random.random"),
-        (random, "randint", "random.randint"),
-        (random, "randrange", "random.randrange"),
-        (random, "choice", "random.choice"),
-        (random, "shuffle", "random.shuffle"),
-        (secrets, "token_bytes", "secrets.token_bytes"),
-        (secrets, "token_hex", "secrets.token_hex"),
-        (secrets, "token_urlsafe", "secrets.token_urlsafe"),
-        (os, "urandom", "os.urandom"),
-        (uuid, "uuid4", "uuid.uuid4"),
-        (time, "time", "time.time"),
-        (time, "sleep", "time.sleep"),
-        (time, "monotonic", "time.monotonic"),
-        (time, "perf_counter", "time.perf_counter"),
-        (os, "getenv", "os.getenv"),
-        (os, "system", "os.system"),
-        (os, "popen", "os.popen"),
-        (os, "_exit", "os._exit"),
-        (sys, "exit", "sys.exit"),
-        (subprocess, "run", "subprocess.run"),
-        (subprocess, "Popen", "subprocess.Popen"),
-        (subprocess, "call", "subprocess.call"),
-        (subprocess, "check_call", "subprocess.check_call"),
-        (subprocess, "check_output", "subprocess.check_output"),
-        (socket, "socket", "socket.socket"),
-        (threading.Thread, "start", "threading.Thread.start"),
-        (multiprocessing.Process, "start", "multiprocessing.Process.start"),
-        (
-            futures.ThreadPoolExecutor,
-            "__init__",
-            "ThreadPoolExecutor.__init__",
-        ),
-        (
-            futures.ProcessPoolExecutor,
-            "__init__",
-            "ProcessPoolExecutor.__init__",
-        ),
-        (logging.Logger, "_log", "logging"),
-        (warnings, "warn", "warnings.warn"),
-        (atexit, "register", "atexit.register"),
-    ):
-        patch_callable(func_obj, attr, name)
-
-    patch_value(
-        datetime,
-        "datetime",
-        lambda _orig: _make_datetime_proxy(strict=strict),
-    )
-
-    patch_value(
-        os,
-        "environ",
-        lambda original: _TrapEnviron(
-            strict=strict,
-            original=cast("MutableMapping[str, str]", original),
-        ),
-    )
+        extra.append((obj, attr, original))
+
+    environ_trap, stdout_trap, stderr_trap = _VALUE_TRAPS[strict]
+    # A trap that is already installed, by an enclosing call on this thread,
+    # must not be pointed at itself.
+    environ = os.environ
+    if environ is not environ_trap:
+        environ_trap._original = environ
+        extra.append((os, "environ", environ))
+        setattr(os, "environ", environ_trap)  # noqa: B010
+    for attr, trap in (("stdout", stdout_trap), ("stderr", stderr_trap)):
+        original = getattr(sys, attr)
+        if original is not trap:
+            trap._original = original
+            extra.append((sys, attr, original))
+            setattr(sys, attr, trap)
+
+    for obj, attr, name in optional_targets:
+        patch_callable(obj, attr, name)
+
+    return originals, extra
+
+
+def _restore(patches: _Patches) -> None:
+    """Revert previously applied monkeypatches.
 
-    patch_value(
-        sys,
-        "stdout",
-        lambda original: _TrapStdIO(strict=strict, original=original),
-    )
-    patch_value(
-        sys,
-        "stderr",
-        lambda original: _TrapStdIO(strict=strict, original=original),
-    )
+    Parameters
+    ----------
+    patches : tuple[tuple[object, ...], list[tuple[object, str, object]]]
+        Patch descriptors returned by :func:`_apply_patches`.
+    """
+    originals, extra = patches
+    for obj, attr, original in reversed(extra):
+        setattr(obj, attr, original)
+    _RESTORE_FIXED(originals)
 
-    with suppress(Exception):
-        sqlite3 = importlib.import_module("sqlite3")
-        patch_callable(sqlite3, "connect", "sqlite3.connect")
-    with suppress(Exception):
-        psycopg2 = importlib.import_module("psycopg2")
-        patch_callable(psycopg2, "connect", "psycopg2.connect")
-    with suppress(Exception):
-        mysql_connector = importlib.import_module("mysql.connector")
-        patch_callable(mysql_connector, "connect", "mysql.connector.connect")
 
-    with suppress(Exception):
-        import http.client as http_client
+def _activate(strict: bool) -> tuple[_Activation, Token[_Activation | None], _Patches]:
+    """Install the traps of a call that holds ``_SIDE_EFFECT_LOCK``.
 
-        patch_callable(http_client, "HTTPConnection", "http.client.HTTPConnection")
-        patch_callable(http_client, "HTTPSConnection", "http.client.HTTPSConnection")
+    Parameters
+    ----------
+    strict : bool
+        When ``False`` original behaviour is preserved after emitting warnings.
 
-    return patches
+    Returns:
+    -------
+    tuple[_Activation, Token[_Activation | None], _Patches]
+        The call's record, the token restoring ``_ACTIVE_CALL`` and the
+        patches to undo, all to be passed to :func:`_deactivate`.
+    """
+    global _installed
+    patches = _apply_patches(strict)
+    activation = _Activation(strict, _installed)
+    _installed = activation
+    return activation, _ACTIVE_CALL.set(activation), patches
 
 
-def _restore(patches: list[tuple[object, str, object]]) -> None:
-    """Revert previously applied monkeypatches.
+def _deactivate(
+    activation: _Activation, token: Token[_Activation | None], patches: _Patches
+) -> None:
+    """Undo :func:`_activate` once the decorated call has finished.
 
     Parameters
     ----------
-    patches : list[tuple[object, str, object]]
-        Patch descriptors returned by :func:`_apply_patches`.
+    activation : _Activation
+        The record of the finished call.
+    token : Token[_Activation | None]
+        The token restoring ``_ACTIVE_CALL``.
+    patches : _Patches
+        The patches applied for the call.
     """
-    for obj, attr, original in reversed(patches):
-        setattr(obj, attr, original)
+    global _installed
+    activation.live = False
+    _ACTIVE_CALL.reset(token)
+    _restore(patches)
+    _installed = activation.enclosing
 
 
 @overload
@@ -453,7 +800,9 @@ def forbid_side_effects[**P, T](
     fn : Callable[P, T] | None, optional
         The synchronous or asynchronous callable to wrap.
     enabled : bool, optional
-        If ``False`` skip decorating and return ``fn`` unchanged.
+        If ``False`` skip decorating and return ``fn`` unchanged. Decorating is
+        also skipped when the ``PURE_FN_ENFORCE`` environment variable was set
+        to ``0`` at import time.
     strict : bool, optional
         When ``False`` warn about attempted side effects but allow the original
         call to proceed.
@@ -463,34 +812,65 @@ def forbid_side_effects[**P, T](
     Callable
         Either the decorated function or a decorator awaiting a function,
         depending on whether ``fn`` was provided.
+
+    Notes:
+    -----
+    A decorated call made while another one is running in the same thread or
+    task neither takes the lock nor patches again when the enclosing call is
+    at least as strict; its traps already apply. Only a strict call nested
+    in a warn-only one installs its own, stricter traps. Asyncio tasks
+    created during a call are only treated as nested while it is running.
     """
 
     def decorator(func: Callable[P, T]) -> Callable[P, T]:
-        if not enabled:
+        if not enabled or not _DEFAULT_ENABLED:
             return func
+        _install_audit_hook()
 
         if inspect.iscoroutinefunction(func):
             async_fn = cast("Callable[P, Awaitable[object]]", func)
 
             @wraps(func)
             async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> object:
-                async with _SIDE_EFFECT_LOCK:
-                    patches = _apply_patches(strict)
+                enclosing = _enclosing_call()
+                if enclosing is not None and (enclosing.strict or not strict):
+                    return await async_fn(*args, **kwargs)
+                # A nested call runs under the lock its enclosing call holds;
+                # queueing on the loop's ``asyncio.Lock`` again would deadlock.
+                async with (
+                    nullcontext() if enclosing is not None else _SIDE_EFFECT_LOCK
+                ):
+                    activation, token, patches = _activate(strict)
                     try:
                         return await async_fn(*args, **kwargs)
                     finally:
-                        _restore(patches)
+                        _deactivate(activation, token, patches)
 
             return cast("Callable[P, T]", async_wrapper)
 
         @wraps(func)
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            enclosing = _enclosing_call()
+            if enclosing is not None and (enclosing.strict or not strict):
+                # An enclosing call already traps at least as strictly.
+                return func(*args, **kwargs)
             with _SIDE_EFFECT_LOCK:
-                patches = _apply_patches(strict)
+                # The lock is re-entered, without a record in this context, by
+                # another task of this thread that holds it while awaiting.
+                # Its traps must not be patched over with ones forwarding to
+                # themselves.
+                installed = _installed
+                if installed is not None and (installed.strict or not strict):
+                    nested = _ACTIVE_CALL.set(installed)
+                    try:
+                        return func(*args, **kwargs)
+                    finally:
+                        _ACTIVE_CALL.reset(nested)
+                activation, token, patches = _activate(strict)
                 try:
                     return func(*args, **kwargs)
                 finally:
-                    _restore(patches)
+                    _deactivate(activation, token, patches)
 
         return wrapper
 
@@ -4,18 +4,42 @@
 from __future__ import annotations
 
 import copy
+import dataclasses
+import hashlib
 import logging
-from functools import wraps
+import os
+import pickle
+from functools import partial, wraps
+from types import MappingProxyType
 from typing import TYPE_CHECKING, Any, Final, cast, overload
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterable, Mapping, Sequence
+    from collections.abc import Callable, Iterable, Sequence
 
 _Path = tuple[str, ...]
-_Diff = tuple[_Path, str]
+_Diff = tuple[_Path, "Callable[[], str]"]
+_Arguments = tuple[tuple[Any, ...], dict[str, Any]]
+# ``(parent, segment)``; kept non-recursive so the module compiles with mypyc.
+# A segment is a label, a sequence index, or a dict key wrapped in a 1-tuple;
+# indices and keys are only formatted when a difference is reported.
+_Link = tuple[Any, object] | None
+type _Frame = tuple[Any, Any, _Link]
+type _Handler = Callable[[Any, Any, _Link, list[_Frame]], _Diff | None]
 
 _LOGGER: Final = logging.getLogger(__name__)
 
+# Setting ``PURE_FN_ENFORCE=0`` turns the decorator into a no-op so production
+# deployments pay no per-call overhead.
+_DEFAULT_ENABLED: Final = os.environ.get("PURE_FN_ENFORCE", "1") != "0"
+
+_ATOMIC_TYPES: Final = frozenset(
+    {type(None), bool, int, float, complex, str, bytes},
+)
+
+
+# Returned by ``_freeze`` for values that have no read-only counterpart.
+_UNFREEZABLE: Final = object()
+
 __all__ = ["immutable_arguments"]
 
 
@@ -35,36 +59,558 @@ def _describe_collection(items: Iterable[Any]) -> str:
     return "[" + ", ".join(sorted(repr(item) for item in items)) + "]"
 
 
-def _compare_sequence(
-    seq_a: Sequence[Any], seq_b: Sequence[Any], path: _Path
-) -> _Diff | None:
-    """Compare two sequences and return the first detected mutation.
+def _describe_values(a: object, b: object) -> str:
+    """Describe a changed value using representations trimmed for display.
+
+    Parameters
+    ----------
+    a : object
+        The value observed after the wrapped function executed.
+    b : object
+        The snapshot of the value prior to function execution.
+
+    Returns:
+    -------
+    str
+        A ``value <a> -> <b>`` message.
+    """
+    left_repr = repr(a)
+    right_repr = repr(b)
+    if len(left_repr) > 200:
+        left_repr = f"{left_repr[:197]}..."
+    if len(right_repr) > 200:
+        right_repr = f"{right_repr[:197]}..."
+    return f"value {left_repr} -> {right_repr}"
+
+
+def _describe_diff(diff: _Diff) -> str:
+    """Format a detected mutation for errors and log records.
+
+    Parameters
+    ----------
+    diff : _Diff
+        The path and deferred description returned by :func:`_first_diff`.
+
+    Returns:
+    -------
+    str
+        The complete diagnostic message.
+    """
+    diff_path, message = diff
+    return f"Argument mutated at {'/'.join(diff_path)}: {message()}"
+
+
+def _is_atomic(value: object) -> bool:
+    """Return whether ``value`` is deeply immutable and needs no snapshot.
+
+    Parameters
+    ----------
+    value : object
+        The argument to inspect.
+
+    Returns:
+    -------
+    bool
+        ``True`` for builtin scalars and for tuples/frozensets made only of
+        such values; ``False`` otherwise.
+
+    Notes:
+    -----
+    Exact type checks are used on purpose: subclasses of builtin scalars may
+    carry a mutable ``__dict__``.
+    """
+    value_type = type(value)
+    if value_type in _ATOMIC_TYPES:
+        return True
+    if value_type is tuple or value_type is frozenset:
+        return _all_atomic(cast("Iterable[object]", value))
+    return False
+
+
+def _all_atomic(values: Iterable[object]) -> bool:
+    """Return whether every item of ``values`` passes :func:`_is_atomic`.
+
+    Parameters
+    ----------
+    values : Iterable[object]
+        The arguments or container items to inspect.
+
+    Returns:
+    -------
+    bool
+        ``True`` if none of the values needs a snapshot.
+    """
+    atomic_types = _ATOMIC_TYPES
+    for value in values:
+        # The inline type test settles the common scalar case without a call.
+        if type(value) not in atomic_types and not _is_atomic(value):
+            return False
+    return True
+
+
+def _freeze(value: object, active: set[int]) -> object:
+    """Return a read-only counterpart of a builtin container tree.
+
+    Parameters
+    ----------
+    value : object
+        The argument to convert.
+    active : set[int]
+        Identities of the containers currently being converted, used to
+        detect cycles.
+
+    Returns:
+    -------
+    object
+        ``value`` itself when atomic; otherwise a tree in which dicts become
+        ``MappingProxyType`` views, lists and tuples become tuples and sets
+        become frozensets. ``_UNFREEZABLE`` is returned if any part of the
+        tree is not a builtin container or scalar, or if it is cyclic.
+    """
+    value_type = type(value)
+    if value_type in _ATOMIC_TYPES:
+        return value
+    if value_type is not dict and value_type is not list and value_type is not tuple:
+        if (value_type is set or value_type is frozenset) and all(
+            _is_atomic(item) for item in cast("Iterable[object]", value)
+        ):
+            return frozenset(cast("Iterable[object]", value))
+        return _UNFREEZABLE
+    identity = id(value)
+    if identity in active:
+        return _UNFREEZABLE
+    active.add(identity)
+    try:
+        if value_type is dict:
+            frozen_items: dict[object, object] = {}
+            for key, item in cast("dict[object, object]", value).items():
+                frozen = _freeze(item, active)
+                if frozen is _UNFREEZABLE or not _is_atomic(key):
+                    return _UNFREEZABLE
+                frozen_items[key] = frozen
+            return MappingProxyType(frozen_items)
+        frozen_values: list[object] = []
+        for item in cast("Iterable[object]", value):
+            frozen = _freeze(item, active)
+            if frozen is _UNFREEZABLE:
+                return _UNFREEZABLE
+            frozen_values.append(frozen)
+        return tuple(frozen_values)
+    finally:
+        active.discard(identity)
+
+
+def _freeze_arguments(
+    args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> tuple[list[Any], dict[str, Any], list[int], list[str]]:
+    """Replace freezable arguments by their read-only counterparts.
+
+    Parameters
+    ----------
+    args : tuple[Any, ...]
+        Positional arguments of the call.
+    kwargs : dict[str, Any]
+        Keyword arguments of the call.
+
+    Returns:
+    -------
+    tuple[list[Any], dict[str, Any], list[int], list[str]]
+        The arguments to call with, followed by the positions and keys of
+        the arguments that could not be frozen and still need a snapshot.
+    """
+    call_args = list(args)
+    positions: list[int] = []
+    for index, value in enumerate(args):
+        frozen = _freeze(value, set())
+        if frozen is _UNFREEZABLE:
+            positions.append(index)
+        else:
+            call_args[index] = frozen
+    call_kwargs = dict(kwargs)
+    keys: list[str] = []
+    for key, value in kwargs.items():
+        frozen = _freeze(value, set())
+        if frozen is _UNFREEZABLE:
+            keys.append(key)
+        else:
+            call_kwargs[key] = frozen
+    return call_args, call_kwargs, positions, keys
+
+
+def _pickle_arguments(args: tuple[Any, ...], kwargs: dict[str, Any]) -> bytes | None:
+    """Serialize ``args`` and ``kwargs`` for copying and change detection.
+
+    Parameters
+    ----------
+    args : tuple[Any, ...]
+        Positional arguments to serialize.
+    kwargs : dict[str, Any]
+        Keyword arguments to serialize.
+
+    Returns:
+    -------
+    bytes | None
+        The pickled arguments, or ``None`` if they cannot be pickled (locks,
+        local classes, ...).
+
+    Notes:
+    -----
+    A pickle serializes the whole argument graph in a single C-level pass,
+    which is considerably cheaper than ``copy.deepcopy``. Objects shared
+    between the positional and keyword arguments remain shared once loaded.
+    """
+    try:
+        return pickle.dumps((args, kwargs), protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return None
+
+
+def _unpickle_arguments(data: bytes) -> _Arguments:
+    """Load fresh copies of arguments serialized by :func:`_pickle_arguments`.
 
     Parameters
     ----------
-    seq_a : Sequence[Any]
-        The sequence captured in the snapshot prior to invoking the function.
-    seq_b : Sequence[Any]
-        The sequence observed after the function executed.
-    path : _Path
-        The navigation path used for diagnostic messages.
+    data : bytes
+        The payload returned by :func:`_pickle_arguments`.
+
+    Returns:
+    -------
+    _Arguments
+        Independent copies of the positional and keyword arguments.
+    """
+    # The payload was produced by ``_pickle_arguments`` from in-process objects.
+    return cast("_Arguments", pickle.loads(data))  # noqa: S301
+
+
+def _digest(data: bytes) -> bytes:
+    """Return a compact fingerprint of pickled arguments.
+
+    Parameters
+    ----------
+    data : bytes
+        The payload returned by :func:`_pickle_arguments`.
+
+    Returns:
+    -------
+    bytes
+        A 16-byte BLAKE2b digest of ``data``.
+    """
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _deepcopy(value: Any, memo: dict[int, Any]) -> Any:
+    """Deep-copy ``value`` like ``copy.deepcopy`` with builtin fast paths.
+
+    Parameters
+    ----------
+    value : Any
+        The object to copy.
+    memo : dict[int, Any]
+        The ``copy.deepcopy`` memo shared by the whole copy, which preserves
+        aliasing and cycles.
+
+    Returns:
+    -------
+    Any
+        The copy.
+
+    Notes:
+    -----
+    Atomic values, including tuples and frozensets made only of builtin
+    scalars, are returned as-is, and exact lists, dicts and tuples are copied
+    directly, skipping the dispatch and memo bookkeeping that
+    ``copy.deepcopy`` performs for every node. Lists and dicts holding only
+    atomic values are copied shallowly in a single C-level call. Anything
+    else is delegated to ``copy.deepcopy`` with the same memo.
+    """
+    value_type = type(value)
+    if value_type in _ATOMIC_TYPES:
+        return value
+    if (value_type is tuple or value_type is frozenset) and _all_atomic(value):
+        # ``copy.deepcopy`` would rebuild a frozenset through ``__reduce_ex__``.
+        return value
+    if value_type is list:
+        copied_list = memo.get(id(value))
+        if copied_list is None:
+            if _all_atomic(value):
+                # Nothing to copy below, so a C-level slice copy suffices.
+                copied_list = memo[id(value)] = value[:]
+            else:
+                copied_list = memo[id(value)] = []
+                copied_list.extend([_deepcopy(item, memo) for item in value])
+        return copied_list
+    if value_type is dict:
+        copied_dict = memo.get(id(value))
+        if copied_dict is None:
+            if _all_atomic(value) and _all_atomic(value.values()):
+                copied_dict = memo[id(value)] = value.copy()
+            else:
+                copied_dict = memo[id(value)] = {}
+                for key, item in value.items():
+                    copied_dict[_deepcopy(key, memo)] = _deepcopy(item, memo)
+        return copied_dict
+    if value_type is tuple:
+        items = [_deepcopy(item, memo) for item in value]
+        # A tuple in a cycle may have been copied while copying its items.
+        copied_tuple = memo.get(id(value))
+        if copied_tuple is None:
+            if all(new is old for new, old in zip(items, value, strict=True)):
+                copied_tuple = value
+            else:
+                copied_tuple = tuple(items)
+            memo[id(value)] = copied_tuple
+        return copied_tuple
+    return copy.deepcopy(value, memo)
+
+
+def _deepcopy_arguments(args: tuple[Any, ...], kwargs: dict[str, Any]) -> _Arguments:
+    """Return deep copies of arguments that cannot be pickled.
+
+    Parameters
+    ----------
+    args : tuple[Any, ...]
+        Positional arguments to copy.
+    kwargs : dict[str, Any]
+        Keyword arguments to copy.
+
+    Returns:
+    -------
+    _Arguments
+        The copied positional and keyword arguments, sharing one memo.
+    """
+    memo: dict[int, Any] = {}
+    return _deepcopy(args, memo), _deepcopy(kwargs, memo)
+
+
+def _materialize(link: _Link) -> _Path:
+    """Rebuild the path tuple described by a chain of path links.
+
+    Parameters
+    ----------
+    link : _Link
+        The innermost link of the chain, or ``None`` for the empty path.
+
+    Returns:
+    -------
+    _Path
+        The path segments ordered from the root to ``link``, with indices
+        rendered as ``[0]`` and dict keys as ``['key']``.
+    """
+    segments: list[str] = []
+    while link is not None:
+        link, segment = link
+        if type(segment) is int:
+            segments.append(f"[{segment}]")
+        elif type(segment) is tuple:
+            segments.append(f"[{segment[0]!r}]")
+        else:
+            segments.append(cast("str", segment))
+    segments.reverse()
+    return tuple(segments)
+
+
+def _diff_dict(a: Any, b: Any, link: _Link, stack: list[_Frame]) -> _Diff | None:
+    """Compare two dictionaries and queue their values for comparison.
+
+    Parameters
+    ----------
+    a : Any
+        The dictionary observed after the wrapped function executed.
+    b : Any
+        The snapshot of the dictionary prior to function execution.
+    link : _Link
+        The path to the dictionaries.
+    stack : list[_Frame]
+        The pending comparisons; child values are pushed onto it.
 
     Returns:
     -------
     _Diff | None
-        ``None`` if the sequences are identical, otherwise the path and
-        description of the first difference encountered.
+        The key-set difference if the keys changed, otherwise ``None``.
     """
+    a_dict = cast("dict[object, object]", a)
+    b_dict = cast("dict[object, object]", b)
+    a_keys = a_dict.keys()
+    b_keys = b_dict.keys()
+    if a_keys != b_keys:
+        missing = a_keys - b_keys
+        added = b_keys - a_keys
+        path = _materialize((link, "<dict-keys>"))
+        if missing:
+            return path, lambda: f"missing keys {_describe_collection(missing)}"
+        return path, lambda: f"added keys {_describe_collection(added)}"
+    for key, value in reversed(a_dict.items()):
+        stack.append((value, b_dict[key], (link, (key,))))
+    return None
+
+
+def _diff_sequence(a: Any, b: Any, link: _Link, stack: list[_Frame]) -> _Diff | None:
+    """Compare two sequences and queue their items for comparison.
+
+    Parameters
+    ----------
+    a : Any
+        The sequence observed after the wrapped function executed.
+    b : Any
+        The snapshot of the sequence prior to function execution.
+    link : _Link
+        The path to the sequences.
+    stack : list[_Frame]
+        The pending comparisons; items are pushed onto it.
+
+    Returns:
+    -------
+    _Diff | None
+        The length difference if the lengths changed, otherwise ``None``.
+    """
+    seq_a = cast("Sequence[Any]", a)
+    seq_b = cast("Sequence[Any]", b)
     if len(seq_a) != len(seq_b):
-        return (*path, "<len>"), f"{len(seq_a)} -> {len(seq_b)}"
-    for index, (left, right) in enumerate(zip(seq_a, seq_b, strict=True)):
-        diff = _first_diff(left, right, (*path, f"[{index}]"))
-        if diff:
-            return diff
+        return _materialize((link, "<len>")), lambda: f"{len(seq_a)} -> {len(seq_b)}"
+    for index in range(len(seq_a) - 1, -1, -1):
+        stack.append((seq_a[index], seq_b[index], (link, index)))
     return None
 
 
-def _first_diff(a: Any, b: Any, path: _Path = ()) -> _Diff | None:
+def _diff_set(a: Any, b: Any, link: _Link, _stack: list[_Frame]) -> _Diff | None:
+    """Compare two sets or frozensets.
+
+    Parameters
+    ----------
+    a : Any
+        The set observed after the wrapped function executed.
+    b : Any
+        The snapshot of the set prior to function execution.
+    link : _Link
+        The path to the sets.
+    _stack : list[_Frame]
+        The pending comparisons; unused because set members are compared
+        as a whole.
+
+    Returns:
+    -------
+    _Diff | None
+        ``None`` if the sets are equal, otherwise the removed and added items.
+    """
+    a_set = cast("set[object]", a)
+    b_set = cast("set[object]", b)
+    if a_set != b_set:
+        return (
+            _materialize(link),
+            lambda: (
+                f"set changed; -{_describe_collection(a_set - b_set)}"
+                f" +{_describe_collection(b_set - a_set)}"
+            ),
+        )
+    return None
+
+
+_HANDLERS: Final[dict[type, _Handler]] = {
+    dict: _diff_dict,
+    list: _diff_sequence,
+    tuple: _diff_sequence,
+    set: _diff_set,
+    frozenset: _diff_set,
+}
+
+# Handler resolved for every type seen so far, including ``None`` for types
+# without one, so each node costs a single dictionary lookup.
+_RESOLVED_HANDLERS: Final[dict[type, _Handler | None]] = dict(_HANDLERS)
+
+
+def _resolve_handler(cls: type) -> _Handler | None:
+    """Find and memoize the comparison handler for ``cls``.
+
+    Parameters
+    ----------
+    cls : type
+        The type of a value being compared.
+
+    Returns:
+    -------
+    _Handler | None
+        The handler registered for the nearest base class of ``cls``, so that
+        subclasses of builtin containers are compared like their base, or
+        ``None`` if no base class has one.
+    """
+    handler = next(
+        (_HANDLERS[base] for base in cls.__mro__ if base in _HANDLERS),
+        None,
+    )
+    _RESOLVED_HANDLERS[cls] = handler
+    return handler
+
+
+# Whether instances of a type carry a ``__dict__``, memoized per type.
+_HAS_INSTANCE_DICT: Final[dict[type, bool]] = {}
+
+
+def _has_instance_dict(cls: type) -> bool:
+    """Return whether instances of ``cls`` have a ``__dict__``.
+
+    Parameters
+    ----------
+    cls : type
+        The type of a value being compared.
+
+    Returns:
+    -------
+    bool
+        ``True`` if the type reserves an instance dictionary, i.e. it is not
+        a builtin or ``__slots__``-only class.
+    """
+    has_dict = _HAS_INSTANCE_DICT.get(cls)
+    if has_dict is None:
+        has_dict = _HAS_INSTANCE_DICT[cls] = cls.__dictoffset__ != 0
+    return has_dict
+
+
+# ``(field name, path segment)`` pairs of ``__dict__``-less dataclasses, or
+# ``None`` for any other type, memoized per type.
+_SLOTTED_FIELDS: Final[dict[type, tuple[tuple[str, str], ...] | None]] = {}
+
+# Stands in for a dataclass slot that is not set.
+_UNSET: Final = object()
+
+
+def _slotted_fields(cls: type) -> tuple[tuple[str, str], ...] | None:
+    """Return the fields to compare for a ``__dict__``-less dataclass.
+
+    Parameters
+    ----------
+    cls : type
+        The type of a value being compared, known to have no ``__dict__``.
+
+    Returns:
+    -------
+    tuple[tuple[str, str], ...] | None
+        The field names with their ``.name`` path segments if ``cls`` is a
+        dataclass (typically declared with ``slots=True``), otherwise
+        ``None``.
+    """
+    try:
+        return _SLOTTED_FIELDS[cls]
+    except KeyError:
+        pass
+    fields = (
+        tuple((field.name, f".{field.name}") for field in dataclasses.fields(cls))
+        if dataclasses.is_dataclass(cls)
+        else None
+    )
+    _SLOTTED_FIELDS[cls] = fields
+    return fields
+
+
+# Stands in for ``seen`` when a comparison shares no pairs with others.
+_NO_PAIRS: Final[frozenset[tuple[int, int]]] = frozenset()
+
+
+def _first_diff(
+    a: Any,
+    b: Any,
+    path: _Path = (),
+    seen: set[tuple[int, int]] | None = None,
+) -> _Diff | None:
     """Return the first difference between ``a`` and ``b`` (if any).
 
     Parameters
@@ -76,83 +622,102 @@ def _first_diff(a: Any, b: Any, path: _Path = ()) -> _Diff | None:
     path : _Path, optional
         The hierarchical path used to build informative error messages,
         by default ``()``.
+    seen : set[tuple[int, int]] | None, optional
+        Identity pairs of containers whose subtrees compared equal. Passing
+        the same set to the comparisons of one call's arguments skips
+        subtrees shared between arguments once they were found unchanged.
+        The pairs compared here are only added if no difference is found,
+        since the walk stops at the first one. All the objects must stay
+        alive while the set is in use.
 
     Returns:
     -------
     _Diff | None
         ``None`` if no mutation is detected, otherwise the path segment and
-        description of the detected change.
+        a callable producing the description of the detected change. The
+        description is deferred because building it may ``repr`` or sort
+        large values, and it is not needed when the warning is filtered.
+
+    Notes:
+    -----
+    The object graphs are walked depth-first with an explicit stack rather
+    than recursion, so deeply nested arguments cannot exhaust the
+    interpreter stack. Identical objects are never descended into and
+    builtin scalars are compared without any further dispatch. Paths
+    are kept as linked ``(parent, segment)`` pairs, with raw indices and
+    keys as segments, and only turned into strings when a difference is
+    reported. Containers already compared are skipped, which also
+    terminates on cyclic values.
     """
-    if type(a) is not type(b):
-        return path, f"type {type(a).__name__} -> {type(b).__name__}"
-
-    if isinstance(a, dict) and isinstance(b, dict):
-        a_dict = cast("dict[object, object]", a)
-        b_dict = cast("dict[object, object]", b)
-        a_keys: set[object] = set(a_dict.keys())
-        b_keys: set[object] = set(b_dict.keys())
-        if a_keys != b_keys:
-            missing = a_keys - b_keys
-            added = b_keys - a_keys
-            if missing:
-                return (
-                    *path,
-                    "<dict-keys>",
-                ), f"missing keys {_describe_collection(missing)}"
-            if added:
-                return (
-                    *path,
-                    "<dict-keys>",
-                ), f"added keys {_describe_collection(added)}"
-        for key in a_dict:
-            diff = _first_diff(a_dict[key], b_dict[key], (*path, f"[{key!r}]"))
+    root: _Link = None
+    for segment in path:
+        root = (root, segment)
+
+    stack: list[_Frame] = [(a, b, root)]
+    unchanged = _NO_PAIRS if seen is None else seen
+    # Pairs being compared by this walk, which also terminates on cycles.
+    visited: set[tuple[int, int]] = set()
+    while stack:
+        a, b, link = stack.pop()
+        if a is b:
+            continue
+        a_type = type(a)
+        if a_type is not type(b):
+            return _materialize(link), partial(
+                "type {} -> {}".format, a_type.__name__, type(b).__name__
+            )
+        if a_type in _ATOMIC_TYPES:
+            # Scalars have no handler and no ``__dict__``; compare them directly.
+            if a != b:
+                return _materialize(link), partial(_describe_values, a, b)
+            continue
+
+        try:
+            handler = _RESOLVED_HANDLERS[a_type]
+        except KeyError:
+            handler = _resolve_handler(a_type)
+
+        if handler is not None:
+            pair = (id(a), id(b))
+            if pair in visited or pair in unchanged:
+                continue
+            visited.add(pair)
+            diff = handler(a, b, link, stack)
             if diff:
                 return diff
-        return None
-
-    if isinstance(a, list) and isinstance(b, list):
-        return _compare_sequence(
-            cast("Sequence[Any]", a), cast("Sequence[Any]", b), path
-        )
-
-    if isinstance(a, tuple) and isinstance(b, tuple):
-        return _compare_sequence(
-            cast("Sequence[Any]", a), cast("Sequence[Any]", b), path
-        )
-
-    if isinstance(a, set) and isinstance(b, set):
-        a_set: set[object] = cast("set[object]", a)
-        b_set: set[object] = cast("set[object]", b)
-        if a_set != b_set:
-            removed_desc = _describe_collection(a_set - b_set)
-            added_desc = _describe_collection(b_set - a_set)
-            return path, f"set changed; -{removed_desc} +{added_desc}"
-        return None
-
-    if isinstance(a, frozenset) and isinstance(b, frozenset):
-        a_items: set[object] = set(cast("Iterable[object]", a))
-        b_items: set[object] = set(cast("Iterable[object]", b))
-        if a_items != b_items:
-            removed_desc = _describe_collection(a_items - b_items)
-            added_desc = _describe_collection(b_items - a_items)
-            return path, f"set changed; -{removed_desc} +{added_desc}"
-        return None
-
-    a_obj: object = cast("object", a)
-    b_obj: object = cast("object", b)
-    if hasattr(a_obj, "__dict__") and hasattr(b_obj, "__dict__"):
-        a_mapping = cast("Mapping[str, Any]", a_obj.__dict__)
-        b_mapping = cast("Mapping[str, Any]", b_obj.__dict__)
-        return _first_diff(a_mapping, b_mapping, (*path, ".__dict__"))
-
-    if a_obj != b_obj:
-        left_repr = repr(a_obj)
-        right_repr = repr(b_obj)
-        if len(left_repr) > 200:
-            left_repr = f"{left_repr[:197]}..."
-        if len(right_repr) > 200:
-            right_repr = f"{right_repr[:197]}..."
-        return path, f"value {left_repr} -> {right_repr}"
+            continue
+
+        a_obj: object = cast("object", a)
+        b_obj: object = cast("object", b)
+        if _has_instance_dict(a_type):
+            pair = (id(a_obj), id(b_obj))
+            if pair in visited or pair in unchanged:
+                continue
+            visited.add(pair)
+            stack.append((a_obj.__dict__, b_obj.__dict__, (link, ".__dict__")))
+            continue
+
+        fields = _slotted_fields(a_type)
+        if fields is not None:
+            pair = (id(a_obj), id(b_obj))
+            if pair in visited or pair in unchanged:
+                continue
+            visited.add(pair)
+            # Compared field by field, so the report names the changed field.
+            for name, segment in reversed(fields):
+                stack.append(
+                    (
+                        getattr(a_obj, name, _UNSET),
+                        getattr(b_obj, name, _UNSET),
+                        (link, segment),
+                    )
+                )
+            continue
+
+        if a_obj != b_obj:
+            return _materialize(link), partial(_describe_values, a_obj, b_obj)
+    if seen is not None:
+        seen.update(visited)
     return None
 
 
@@ -163,6 +728,11 @@ def immutable_arguments[**P, T](
     warn_only: bool = False,
     enabled: bool = True,
     strict: bool = True,
+    diff: bool = True,
+    readonly: bool = False,
+    sample_every: int = 1,
+    sampling_warmup: int = 1024,
+    in_place: bool = False,
 ) -> Callable[P, T]: ...
 
 
@@ -172,6 +742,11 @@ def immutable_arguments[**P, T](
     warn_only: bool = False,
     enabled: bool = True,
     strict: bool = True,
+    diff: bool = True,
+    readonly: bool = False,
+    sample_every: int = 1,
+    sampling_warmup: int = 1024,
+    in_place: bool = False,
 ) -> Callable[[Callable[P, T]], Callable[P, T]]: ...
 
 
@@ -181,6 +756,11 @@ def immutable_arguments[**P, T](
     warn_only: bool = False,
     enabled: bool = True,
     strict: bool = True,
+    diff: bool = True,
+    readonly: bool = False,
+    sample_every: int = 1,
+    sampling_warmup: int = 1024,
+    in_place: bool = False,
 ) -> Callable[[Callable[P, T]], Callable[P, T]] | Callable[P, T]:
     """Prevent and surface in-place mutations performed by ``fn``.
 
@@ -193,10 +773,39 @@ def immutable_arguments[**P, T](
         If ``True`` log detected mutations instead of raising
         ``RuntimeError``.
     enabled : bool, optional
-        If ``False`` skip decorating and return ``fn`` unchanged.
+        If ``False`` skip decorating and return ``fn`` unchanged. Decorating is
+        also skipped when the ``PURE_FN_ENFORCE`` environment variable was set
+        to ``0`` at import time.
     strict : bool, optional
         When ``False`` log warnings instead of raising ``RuntimeError`` when
         mutations are detected.
+    diff : bool, optional
+        If ``False`` only report *that* picklable arguments changed, using a
+        digest of their pickle, instead of locating the first difference.
+        The pre-call pickle is then not retained while ``fn`` runs.
+    readonly : bool, optional
+        If ``True`` pass arguments built only from builtin dicts, lists,
+        tuples, sets and scalars as read-only counterparts
+        (``MappingProxyType``, ``tuple`` and ``frozenset``) instead of
+        copying and comparing them, so a mutation attempt fails with
+        ``TypeError`` or ``AttributeError`` where it happens. Other
+        arguments are still copied and compared.
+    sample_every : int, optional
+        If greater than ``1``, once ``sampling_warmup`` consecutive checked
+        calls found no mutation, only check one call in ``sample_every`` and
+        call ``fn`` directly otherwise. Any reported mutation, or exception,
+        resumes checking every call. Detection becomes probabilistic in
+        exchange for near-zero steady-state overhead; by default every call
+        is checked.
+    sampling_warmup : int, optional
+        The number of consecutive clean checked calls after which
+        ``sample_every`` takes effect, by default ``1024``.
+    in_place : bool, optional
+        If ``True`` pass the caller's own objects to ``fn`` and only compare
+        them against the pre-call snapshot afterwards. Mutations are then
+        detected but not prevented: the caller observes them, and in strict
+        mode ``RuntimeError`` is raised once ``fn`` has returned. This skips
+        the copy handed to ``fn``.
 
     Returns:
     -------
@@ -204,55 +813,168 @@ def immutable_arguments[**P, T](
         Either the decorated function or a decorator awaiting a function,
         depending on whether ``fn`` was provided.
 
+    Raises:
+    ------
+    ValueError
+        If ``sample_every`` is less than ``1`` or ``sampling_warmup`` is
+        negative.
+
     Notes:
     -----
-    The decorator deep-copies all positional and keyword arguments, invokes
-    ``fn`` with the copies, and compares the copies against further snapshots.
-    Any mutation is surfaced according to ``warn_only``.
+    The decorator pickles the arguments once, invokes ``fn`` with copies
+    loaded from that pickle, and keeps the pickle as the snapshot: the
+    detailed comparison only runs if the copies no longer pickle to the same
+    bytes. Arguments that cannot be pickled are copied, and snapshotted,
+    with ``copy.deepcopy`` instead. Picklable arguments are therefore copied
+    through their pickling hooks, and a custom ``__deepcopy__`` is not
+    called. With ``in_place`` no copy is handed to ``fn``; only the snapshot
+    is taken. Any mutation is surfaced according to ``warn_only``. Deeply
+    immutable arguments (builtin scalars and tuples/frozensets of them) are
+    passed through without being copied or compared, as are the read-only
+    counterparts passed when ``readonly`` is set.
     """
+    if sample_every < 1:
+        msg = f"sample_every must be at least 1, got {sample_every}"
+        raise ValueError(msg)
+    if sampling_warmup < 0:
+        msg = f"sampling_warmup must not be negative, got {sampling_warmup}"
+        raise ValueError(msg)
 
     def decorator(func: Callable[P, T]) -> Callable[P, T]:
-        if not enabled:
+        if not enabled or not _DEFAULT_ENABLED:
             return func
 
         effective_strict = strict and not warn_only
+        # Sampling state lives in this one closure; mypyc miscompiles a second
+        # closure calling ``wrapper`` while rebinding its own counters.
+        sampling = sample_every > 1
+        clean_calls = 0
+        skipped = 0
 
         @wraps(func)
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-            frozen_memo: dict[int, object] = {}
-            frozen_args = copy.deepcopy(args, frozen_memo)
-            frozen_kwargs = copy.deepcopy(kwargs, frozen_memo)
-
-            snapshot_memo: dict[int, object] = {}
-            args_snapshot = copy.deepcopy(frozen_args, snapshot_memo)
-            kwargs_snapshot = copy.deepcopy(frozen_kwargs, snapshot_memo)
-
-            result = func(*frozen_args, **frozen_kwargs)
-
-            for index, (current, snapshot) in enumerate(
-                zip(frozen_args, args_snapshot, strict=True)
-            ):
-                diff = _first_diff(current, snapshot, path=(f"arg[{index}]",))
-                if diff:
-                    diff_path, message = diff
-                    joined = "/".join(diff_path)
-                    text = f"Argument mutated at {joined}: {message}"
+            nonlocal clean_calls, skipped
+            if sampling and clean_calls >= sampling_warmup:
+                skipped += 1
+                if skipped < sample_every:
+                    try:
+                        return func(*args, **kwargs)
+                    except BaseException:
+                        clean_calls = 0
+                        raise
+                skipped = 0
+            if _all_atomic(args) and (not kwargs or _all_atomic(kwargs.values())):
+                return func(*args, **kwargs)
+
+            call_args: list[Any]
+            call_kwargs: dict[str, Any]
+            if readonly:
+                call_args, call_kwargs, positions, keys = _freeze_arguments(
+                    args, kwargs
+                )
+                if not positions and not keys:
+                    return func(*call_args, **call_kwargs)
+            else:
+                positions = [
+                    index for index, value in enumerate(args) if not _is_atomic(value)
+                ]
+                keys = [key for key, value in kwargs.items() if not _is_atomic(value)]
+                call_args = list(args)
+                call_kwargs = kwargs
+
+            mutable_args = tuple(call_args[index] for index in positions)
+            mutable_kwargs = {key: call_kwargs[key] for key in keys}
+            fingerprint = _pickle_arguments(mutable_args, mutable_kwargs)
+            digest: bytes | None = None
+            if in_place:
+                # ``fn`` runs on the caller's objects, so only the pre-call
+                # snapshot is taken and they are compared against it.
+                frozen_args, frozen_kwargs = mutable_args, mutable_kwargs
+                if fingerprint is None:
+                    args_snapshot, kwargs_snapshot = _deepcopy_arguments(
+                        mutable_args, mutable_kwargs
+                    )
+            elif fingerprint is None:
+                frozen_args, frozen_kwargs = _deepcopy_arguments(
+                    mutable_args, mutable_kwargs
+                )
+                args_snapshot, kwargs_snapshot = _deepcopy_arguments(
+                    frozen_args, frozen_kwargs
+                )
+            else:
+                frozen_args, frozen_kwargs = _unpickle_arguments(fingerprint)
+            if fingerprint is not None and not diff:
+                if not in_place:
+                    # A copied set can iterate, and so pickle, in a different
+                    # order than its original; the digest must come from the
+                    # copies that are pickled again after the call.
+                    copied = _pickle_arguments(frozen_args, frozen_kwargs)
+                    if copied is not None:
+                        fingerprint = copied
+                digest = _digest(fingerprint)
+                fingerprint = None
+
+            if not in_place:
+                for index, frozen in zip(positions, frozen_args, strict=True):
+                    call_args[index] = frozen
+                if keys:
+                    # ``call_kwargs`` is this call's own ``**kwargs`` dict (or
+                    # a copy of it), so it can take the frozen values in place.
+                    call_kwargs.update(frozen_kwargs)
+            clean = clean_calls
+            # Reset while ``fn`` runs, so an exception resumes checking.
+            clean_calls = 0
+            result = func(*call_args, **call_kwargs)
+            clean_calls = clean + 1
+
+            if digest is not None:
+                current_data = _pickle_arguments(frozen_args, frozen_kwargs)
+                if current_data is None or _digest(current_data) != digest:
+                    clean_calls = 0
+                    text = "Argument mutated (fingerprint changed)"
                     if warn_only or not effective_strict:
                         _LOGGER.warning(text)
+                    else:
+                        raise RuntimeError(text)
+                return result
+
+            if fingerprint is not None:
+                # Unchanged arguments pickle to the same bytes, so the
+                # structural diff only runs when something was mutated.
+                if _pickle_arguments(frozen_args, frozen_kwargs) == fingerprint:
+                    return result
+                args_snapshot, kwargs_snapshot = _unpickle_arguments(fingerprint)
+
+            # Arguments loaded from one pickle or deepcopy share subtrees the
+            # caller shared; each such subtree found unchanged is skipped when
+            # it is reached again from a later argument.
+            seen: set[tuple[int, int]] = set()
+            for index, current, snapshot in zip(
+                positions, frozen_args, args_snapshot, strict=True
+            ):
+                found = _first_diff(
+                    current, snapshot, path=(f"arg[{index}]",), seen=seen
+                )
+                if found:
+                    clean_calls = 0
+                    if warn_only or not effective_strict:
+                        if _LOGGER.isEnabledFor(logging.WARNING):
+                            _LOGGER.warning(_describe_diff(found))
                         continue
-                    raise RuntimeError(text)
+                    raise RuntimeError(_describe_diff(found))
 
             for key, current in frozen_kwargs.items():
                 snapshot = kwargs_snapshot[key]
-                diff = _first_diff(current, snapshot, path=(f"kwarg[{key!r}]",))
-                if diff:
-                    diff_path, message = diff
-                    joined = "/".join(diff_path)
-                    text = f"Argument mutated at {joined}: {message}"
+                found = _first_diff(
+                    current, snapshot, path=(f"kwarg[{key!r}]",), seen=seen
+                )
+                if found:
+                    clean_calls = 0
                     if warn_only or not effective_strict:
-                        _LOGGER.warning(text)
+                        if _LOGGER.isEnabledFor(logging.WARNING):
+                            _LOGGER.warning(_describe_diff(found))
                         continue
-                    raise RuntimeError(text)
+                    raise RuntimeError(_describe_diff(found))
 
             return result
 
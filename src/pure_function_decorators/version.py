@@ -5,7 +5,7 @@ from __future__ import annotations
 import tomllib
 from importlib import metadata
 from pathlib import Path
-from typing import Final
+from typing import TYPE_CHECKING, Final
 
 _PYPROJECT_PATH: Final = Path("pyproject.toml")
 
@@ -17,7 +17,8 @@ def get_version_from_metadata() -> str:
 
 def get_version_from_pyproject() -> str:
     """Return the version declared in ``pyproject.toml`` for local builds."""
-    data = tomllib.loads(_PYPROJECT_PATH.read_text("utf-8"))
+    with _PYPROJECT_PATH.open("rb") as handle:
+        data = tomllib.load(handle)
     return str(data["project"]["version"])
 
 
@@ -32,4 +33,37 @@ def get_version() -> str:
             return "unknown"
 
 
-__version__: Final = get_version()
+if TYPE_CHECKING:
+    __version__: str
+
+
+def __getattr__(name: str) -> object:
+    """Resolve ``__version__`` on first access instead of at import.
+
+    Parameters
+    ----------
+    name : str
+        The attribute requested from the module.
+
+    Returns:
+    -------
+    object
+        The package version.
+
+    Raises:
+    ------
+    AttributeError
+        If ``name`` is not ``__version__``.
+
+    Notes:
+    -----
+    Importing the module does not read package metadata or parse
+    ``pyproject.toml``. The resolved version is stored in the module
+    namespace, so later accesses do not come back here.
+    """
+    if name != "__version__":
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    version = get_version()
+    globals()["__version__"] = version
+    return version
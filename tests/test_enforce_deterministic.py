@@ -1,6 +1,10 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import importlib
+import inspect
+import math
 import pickle
 import threading
 
@@ -165,3 +169,276 @@ def test_enabled_false_skips_checks() -> None:
 
     assert bump_without_checks() == 1
     assert bump_without_checks() == 2
+
+
+def test_equal_arguments_of_different_types_cached_separately() -> None:
+    @enforce_deterministic
+    def describe(value: object) -> str:
+        return repr(value)
+
+    assert describe(1) == "1"
+    assert describe(True) == "True"
+    assert describe(1.0) == "1.0"
+    assert describe(-0.0) == "-0.0"
+    assert describe(0.0) == "0.0"
+
+
+def test_positional_and_keyword_calls_keyed_separately() -> None:
+    @enforce_deterministic
+    def describe(*args: object, **kwargs: object) -> str:
+        return f"{args!r} {kwargs!r}"
+
+    assert describe((1, ("a", None))) == "((1, ('a', None)),) {}"
+    assert describe((1, (True,))) == "((1, (True,)),) {}"
+    assert describe("a", 1) == "('a', 1) {}"
+    assert describe("a", b=1) == "('a',) {'b': 1}"
+    assert describe(a=1) == "() {'a': 1}"
+    assert describe(("a", 1)) == "(('a', 1),) {}"
+
+
+def test_results_unequal_to_themselves_allowed() -> None:
+    @enforce_deterministic
+    def not_a_number() -> float:
+        return float("nan")
+
+    assert math.isnan(not_a_number())
+
+
+class Mask:
+    def __init__(self, values: list[bool]) -> None:
+        self.values = values
+
+    def __bool__(self) -> bool:
+        msg = "The truth value of an array is ambiguous"
+        raise ValueError(msg)
+
+    def all(self) -> bool:
+        return all(self.values)
+
+
+class Array:
+    def __init__(self, *values: int) -> None:
+        self.values = values
+        self.shape = (len(values),)
+
+    def __eq__(self, other: object) -> Mask:  # type: ignore[override]
+        assert isinstance(other, Array)
+        return Mask([a == b for a, b in zip(self.values, other.values, strict=False)])
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+def test_array_like_results_compared_elementwise() -> None:
+    values = [Array(1, 2), Array(1, 2), Array(1, 3), Array(1, 3, 5)]
+
+    @enforce_deterministic
+    def next_array() -> Array:
+        return values.pop(0)
+
+    next_array()
+    next_array()
+    with pytest.raises(ValueError, match="Non-deterministic"):
+        next_array()
+    values[:] = [Array(1, 2), Array(1, 2, 3)]
+    next_array()
+    with pytest.raises(ValueError, match="Non-deterministic"):
+        next_array()
+
+
+def test_dataframe_results_compared_by_labels_and_values() -> None:
+    pd = pytest.importorskip("pandas")
+    frames = [
+        pd.DataFrame({"a": [1.0, float("nan")]}),
+        pd.DataFrame({"a": [1.0, float("nan")]}),
+        pd.DataFrame({"a": [1.0, 2.0]}),
+        pd.DataFrame({"b": [1.0, 2.0]}),
+    ]
+
+    @enforce_deterministic
+    def next_frame() -> object:
+        return frames.pop(0)
+
+    next_frame()
+    next_frame()
+    with pytest.raises(ValueError, match="Non-deterministic"):
+        next_frame()
+    with pytest.raises(ValueError, match="Non-deterministic"):
+        next_frame()
+
+
+def test_wrappers_keep_their_own_signature() -> None:
+    def add(x: int, y: int) -> int:
+        return x + y
+
+    @functools.wraps(add)
+    def add_one(y: int) -> int:
+        return add(1, y)
+
+    decorated = enforce_deterministic(add_one)
+    assert decorated(2) == 3
+    assert decorated(y=2) == 3
+
+
+def test_partials_and_callable_instances_use_the_generic_wrapper() -> None:
+    def add(x: int, y: int) -> int:
+        return x + y
+
+    class Doubler:
+        def __call__(self, value: int) -> int:
+            return value * 2
+
+    partial_add = enforce_deterministic(functools.partial(add, 1))
+    assert partial_add(2) == 3
+    assert partial_add(2) == 3
+    doubler = enforce_deterministic(Doubler())
+    assert doubler(3) == 6
+    assert doubler(value=3) == 6
+
+
+def test_maxsize_evicts_least_recently_used() -> None:
+    counter = {"value": 0}
+
+    @enforce_deterministic(maxsize=2)
+    def tagged(key: int) -> tuple[int, int]:
+        counter["value"] += 1
+        return key, counter["value"]
+
+    tagged(1)
+    tagged(2)
+    tagged(3)  # evicts the result for ``1``
+    assert tagged(1) == (1, 4)
+    with pytest.raises(ValueError):
+        tagged(3)
+
+
+def test_environment_switch_disables_wrapping(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    module = importlib.import_module("pure_function_decorators.enforce_deterministic")
+    monkeypatch.setattr(module, "_DEFAULT_ENABLED", False)
+
+    def bump_freely() -> int:
+        return 0
+
+    assert enforce_deterministic(bump_freely) is bump_freely
+
+
+def test_key_reflects_arguments_before_the_call() -> None:
+    @enforce_deterministic
+    def drain(items: list[int]) -> int:
+        total = sum(items)
+        items.clear()
+        return total
+
+    assert drain([1, 2]) == 3
+    assert drain([]) == 0
+
+
+@pytest.mark.parametrize("serializer", ["pickle", "msgpack"])
+def test_structured_arguments_keyed_by_type(
+    monkeypatch: pytest.MonkeyPatch, serializer: str
+) -> None:
+    module = importlib.import_module("pure_function_decorators.enforce_deterministic")
+    monkeypatch.setattr(module, "_KEY_SERIALIZER", serializer)
+
+    @enforce_deterministic
+    def kind(value: object) -> str:
+        return type(value).__name__
+
+    assert kind([1]) == "list"
+    assert kind((1,)) == "tuple"
+    assert kind({"a": [1.0]}) == "dict"
+    assert kind([2**70]) == "list"
+    assert kind([1]) == "list"
+
+
+def test_equivalent_bindings_share_a_key() -> None:
+    counter = {"value": 0}
+
+    @enforce_deterministic
+    def stamp(value: int, /, factor: int = 2) -> int:
+        counter["value"] += value * factor
+        return counter["value"]
+
+    assert stamp(1) == 2
+    with pytest.raises(ValueError, match="Non-deterministic"):
+        stamp(1, 2)
+    with pytest.raises(ValueError, match="Non-deterministic"):
+        stamp(1, factor=2)
+    assert stamp(1, 3) == 9
+    assert stamp.__name__ == "stamp"
+    assert inspect.signature(stamp) == inspect.signature(scaled_reference)
+    with pytest.raises(TypeError, match=r"stamp\(\) missing"):
+        stamp()  # type: ignore[call-arg]
+
+
+def scaled_reference(value: int, /, factor: int = 2) -> int:
+    return value * factor
+
+
+def test_specialized_wrapper_evicts_and_detects_divergence() -> None:
+    counter = {"value": 0}
+
+    @enforce_deterministic(maxsize=2)
+    def stamp(item: object) -> tuple[object, int]:
+        counter["value"] += 1
+        return item, counter["value"]
+
+    stamp(1)
+    stamp([1])
+    stamp(2)  # evicts the result for ``1``
+    assert stamp(1) == (1, 4)
+    with pytest.raises(ValueError, match="Non-deterministic"):
+        stamp(2)
+
+
+def test_parameters_shadowing_wrapper_names_supported() -> None:
+    @enforce_deterministic
+    def _fn(key: str, type: str = "x") -> str:
+        return key + type
+
+    assert _fn("a") == "ax"
+    assert _fn("a", type="x") == "ax"
+
+    anonymous = enforce_deterministic(lambda value: value * 2)
+    assert anonymous(2) == 4
+    largest = enforce_deterministic(max)  # no inspectable signature
+    assert largest(1, 3) == 3
+
+
+def test_keyword_only_and_async_signatures_specialized() -> None:
+    counter = {"value": 0}
+
+    @enforce_deterministic
+    def scaled(value: int, *, factor: int = 2) -> int:
+        counter["value"] += value * factor
+        return counter["value"]
+
+    assert scaled(1) == 2
+    with pytest.raises(ValueError, match="Non-deterministic"):
+        scaled(1, factor=2)
+    with pytest.raises(TypeError):
+        scaled(1, 2)  # type: ignore[call-arg]
+
+    @enforce_deterministic
+    async def async_scaled(value: int, *, factor: int = 2) -> int:
+        counter["value"] += value * factor
+        await asyncio.sleep(0)
+        return counter["value"]
+
+    @enforce_deterministic
+    async def async_total(*values: int) -> int:
+        await asyncio.sleep(0)
+        return sum(values)
+
+    async def runner() -> None:
+        assert await async_scaled(1) == 6
+        with pytest.raises(ValueError, match="Non-deterministic"):
+            await async_scaled(1, factor=2)
+        assert await async_total(1, 2) == await async_total(1, 2) == 3
+
+    assert inspect.iscoroutinefunction(async_scaled)
+    assert inspect.signature(async_scaled).parameters["factor"].kind is (
+        inspect.Parameter.KEYWORD_ONLY
+    )
+    asyncio.run(runner())
@@ -81,3 +81,116 @@ def relaxed(x: int) -> int:
 
 def test_enabled_false_leaves_function_untouched() -> None:
     assert relaxed(4) == 9
+
+
+@forbid_globals(allow=("LATE",))
+def uses_late() -> int:
+    return LATE
+
+
+LATE = 1
+
+
+def test_allowed_globals_read_at_call_time() -> None:
+    global LATE
+    assert uses_late() == 1
+    LATE = 2
+    try:
+        assert uses_late() == 2
+    finally:
+        LATE = 1
+
+
+SCRATCH: int  # only ever bound inside the sandbox
+
+
+@forbid_globals()
+def remember(value: int | None = None) -> int:
+    global SCRATCH
+    if value is not None:
+        SCRATCH = value
+    return SCRATCH
+
+
+def test_sandbox_writes_do_not_outlive_the_call() -> None:
+    assert remember(3) == 3
+    with pytest.raises(NameError):
+        remember()
+    assert "SCRATCH" not in globals()
+
+
+@forbid_globals(allow=("GONE",))
+def uses_gone() -> int:
+    return GONE
+
+
+GONE = 1
+
+
+def test_deleted_allowed_globals_become_unavailable(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    assert uses_gone() == 1
+    monkeypatch.delitem(globals(), "GONE")
+    with pytest.raises(NameError):
+        uses_gone()
+    monkeypatch.undo()
+    assert uses_gone() == 1
+
+
+@forbid_globals()
+def remember_via_exec(value: int | None = None) -> object:
+    if value is not None:
+        exec(f"global EXEC_SCRATCH\nEXEC_SCRATCH = {value}")
+    return eval("EXEC_SCRATCH")
+
+
+def test_exec_writes_do_not_outlive_the_call() -> None:
+    assert remember_via_exec(4) == 4
+    with pytest.raises(NameError):
+        remember_via_exec()
+
+
+def test_sandbox_without_allowed_names_keeps_metadata() -> None:
+    def factorial(n: int) -> int:
+        """Multiply the numbers up to ``n``."""
+        return 1 if n <= 1 else n * factorial(n - 1)
+
+    async def pending() -> int:
+        return 1
+
+    guarded = forbid_globals()(factorial)
+    assert guarded(5) == 120
+    assert guarded.__wrapped__ is factorial  # type: ignore[attr-defined]
+    assert guarded.__doc__ == factorial.__doc__
+    assert guarded.__qualname__ == factorial.__qualname__
+
+    guarded_async = forbid_globals()(pending)
+    assert asyncio.iscoroutinefunction(guarded_async)
+    assert asyncio.run(guarded_async()) == 1
+
+
+g = globals
+
+
+@forbid_globals(allow=("g",))
+def count_via_alias() -> int:
+    namespace = g()
+    namespace["ALIAS_COUNTER"] = namespace.get("ALIAS_COUNTER", 0) + 1
+    return int(namespace["ALIAS_COUNTER"])
+
+
+@forbid_globals()
+def count_via_frame() -> int:
+    import sys
+
+    namespace = sys._getframe().f_globals
+    namespace["FRAME_COUNTER"] = namespace.get("FRAME_COUNTER", 0) + 1
+    return int(namespace["FRAME_COUNTER"])
+
+
+def test_indirect_globals_writes_do_not_outlive_the_call() -> None:
+    assert [count_via_alias() for _ in range(3)] == [1, 1, 1]
+    assert [count_via_frame() for _ in range(3)] == [1, 1, 1]
+    assert "ALIAS_COUNTER" not in globals()
+    assert "FRAME_COUNTER" not in globals()
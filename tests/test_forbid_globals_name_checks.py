@@ -78,3 +78,22 @@ def test_check_names_strict_false_warns(caplog: pytest.LogCaptureFixture) -> Non
 
     assert relaxed(1) == 11
     assert any("Global names referenced" in message for message in caplog.messages)
+
+
+def test_names_beyond_extended_arg_detected() -> None:
+    # Over 256 names forces ``EXTENDED_ARG`` prefixes on the later loads.
+    body = " + ".join(f"g{index}" for index in range(300))
+    namespace: dict[str, object] = {f"g{index}": index for index in range(300)}
+    exec(f"def total():\n    return {body}\n", namespace)
+    total = namespace["total"]
+
+    with pytest.raises(RuntimeError) as ei:
+        forbid_globals(total, check_names=True, sandbox=False)  # type: ignore[call-overload]
+    assert "'g299'" in str(ei.value)
+
+    allowed = forbid_globals(
+        total,
+        allow=[f"g{index}" for index in range(300)],
+        check_names=True,  # type: ignore[call-overload]
+    )
+    assert allowed() == sum(range(300))
@@ -1,6 +1,9 @@
+import asyncio
+import importlib
 import os
 import random
 import sys
+import threading
 import time
 from pathlib import Path
 from typing import cast
@@ -195,3 +198,252 @@ def test_relaxed_environ_operations_warn() -> None:
             os.environ.pop(key, None)
         else:
             os.environ[key] = cast("str", original)
+
+
+@forbid_side_effects
+async def async_total(values: list[int]) -> int:
+    return pure_function(values[0], values[1])
+
+
+@forbid_side_effects
+async def async_print() -> None:
+    print("x")
+
+
+def test_async_calls_share_the_lock_and_restore() -> None:
+    async def runner() -> None:
+        assert await async_total([1, 2]) == 3
+        totals = await asyncio.gather(async_total([1, 2]), async_total([3, 4]))
+        assert list(totals) == [3, 7]
+        with pytest.raises(RuntimeError, match="print"):
+            await async_print()
+
+    asyncio.run(runner())
+    print("side effects restored")
+
+
+def test_hybrid_lock_waits_for_other_threads() -> None:
+    module = importlib.import_module("pure_function_decorators.forbid_side_effects")
+    lock = module._HybridRLock()
+    held = threading.Event()
+    release = threading.Event()
+
+    def hold() -> None:
+        with lock, lock:  # re-entrant within the thread
+            held.set()
+            release.wait()
+
+    async def runner() -> None:
+        async def acquire() -> None:
+            async with lock:
+                pass
+
+        cancelled = asyncio.create_task(acquire())
+        waiting = asyncio.create_task(acquire())
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        release.set()
+        await waiting
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    held.wait()
+    asyncio.run(runner())
+    holder.join()
+    with lock:
+        pass
+
+
+def test_nested_calls_keep_the_strictest_traps(
+    capfd: pytest.CaptureFixture[str],
+) -> None:
+    @forbid_side_effects(strict=False)
+    def relaxed_inner() -> None:
+        print("inner")
+
+    @forbid_side_effects
+    def strict_outer() -> None:
+        relaxed_inner()
+
+    @forbid_side_effects
+    def strict_inner() -> None:
+        print("inner")
+
+    @forbid_side_effects(strict=False)
+    def relaxed_outer() -> int:
+        print("outer")
+        with pytest.raises(RuntimeError, match="print"):
+            strict_inner()
+        print("outer again")
+        return pure_function(1, 2)
+
+    with pytest.raises(RuntimeError, match="print"):
+        strict_outer()
+    assert relaxed_outer() == 3
+    captured = capfd.readouterr()
+    assert captured.out == "outer\nouter again\n"
+
+
+def test_nested_async_calls_do_not_deadlock() -> None:
+    @forbid_side_effects(strict=False)
+    async def relaxed_outer() -> int:
+        with pytest.raises(RuntimeError, match="print"):
+            await async_print()
+        return await async_total([1, 2])
+
+    assert asyncio.run(relaxed_outer()) == 3
+
+
+def test_value_traps_are_reused_and_follow_the_current_streams(
+    capfd: pytest.CaptureFixture[str],
+) -> None:
+    @forbid_side_effects(strict=False)
+    def current_stdout() -> object:
+        print("x")
+        return sys.stdout
+
+    stdout = sys.stdout
+    first = current_stdout()
+    assert current_stdout() is first
+    assert first is not stdout
+    assert sys.stdout is stdout
+    assert capfd.readouterr().out == "x\nx\n"
+
+
+def test_audited_side_effects_are_blocked_through_captured_references(
+    capfd: pytest.CaptureFixture[str],
+) -> None:
+    from subprocess import run  # captured before the decorated call
+
+    @forbid_side_effects
+    def spawn() -> None:
+        run([sys.executable, "-c", "pass"], check=True)
+
+    @forbid_side_effects(strict=False)
+    def relaxed_spawn() -> int:
+        return run([sys.executable, "-c", "pass"], check=True).returncode
+
+    with pytest.raises(RuntimeError, match=r"subprocess\.Popen"):
+        spawn()
+    assert relaxed_spawn() == 0
+    assert "Side effect blocked: subprocess.Popen" in capfd.readouterr().err
+    assert run([sys.executable, "-c", "pass"], check=True).returncode == 0
+
+
+def test_decorated_functions_share_their_traps() -> None:
+    import builtins
+
+    @forbid_side_effects(strict=False)
+    def relaxed_print() -> object:
+        return builtins.print
+
+    @forbid_side_effects(strict=False)
+    def other_relaxed_print() -> object:
+        return builtins.print
+
+    @forbid_side_effects
+    def strict_print() -> object:
+        return builtins.print
+
+    assert relaxed_print() is other_relaxed_print()
+    assert strict_print() is not relaxed_print()
+    assert strict_print() is not builtins.print
+
+
+def test_tasks_outliving_a_decorated_call_are_not_treated_as_nested() -> None:
+    import socket
+
+    @forbid_side_effects
+    def strict_print() -> None:
+        print("x")
+
+    async def later(started: asyncio.Event) -> None:
+        await started.wait()
+        with pytest.raises(RuntimeError, match="print"):
+            strict_print()
+        socket.socket().close()
+
+    @forbid_side_effects
+    async def spawn(started: asyncio.Event) -> asyncio.Task[None]:
+        return asyncio.ensure_future(later(started))
+
+    async def runner() -> None:
+        started = asyncio.Event()
+        task = await spawn(started)
+        started.set()
+        await task
+
+    asyncio.run(runner())
+
+
+def test_sync_calls_from_another_task_reuse_the_installed_traps(
+    capfd: pytest.CaptureFixture[str],
+) -> None:
+    original = time.perf_counter
+
+    @forbid_side_effects(strict=False)
+    def relaxed_clock() -> float:
+        return time.perf_counter()
+
+    @forbid_side_effects
+    def strict_clock() -> float:
+        return time.perf_counter()
+
+    @forbid_side_effects(strict=False)
+    async def relaxed_outer(started: asyncio.Event, resume: asyncio.Event) -> float:
+        started.set()
+        await resume.wait()
+        return time.perf_counter()
+
+    async def other_task(started: asyncio.Event, resume: asyncio.Event) -> float:
+        await started.wait()
+        try:
+            with pytest.raises(RuntimeError, match="perf_counter"):
+                strict_clock()
+            return relaxed_clock()
+        finally:
+            resume.set()
+
+    async def runner() -> tuple[float, float]:
+        started = asyncio.Event()
+        resume = asyncio.Event()
+        return await asyncio.gather(
+            relaxed_outer(started, resume), other_task(started, resume)
+        )
+
+    assert all(isinstance(value, float) for value in asyncio.run(runner()))
+    assert time.perf_counter is original
+    assert capfd.readouterr().err.count("Side effect blocked: time.perf_counter") == 2
+
+
+def test_optional_modules_are_imported_before_trapping(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    module = importlib.import_module("pure_function_decorators.forbid_side_effects")
+    (tmp_path / "pfd_fake_driver.py").write_text(
+        "import os\nimport time\n"
+        "LOADED_AT = time.time()\nHOME = os.environ.get('HOME')\n"
+        "def connect():\n    return 'connected'\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(
+        module,
+        "_OPTIONAL_TARGETS",
+        (("pfd_fake_driver", "connect", "pfd_fake_driver.connect"),),
+    )
+    module._optional_targets.cache_clear()
+    try:
+
+        @forbid_side_effects
+        def connect() -> object:
+            import pfd_fake_driver  # type: ignore[import-not-found]
+
+            return pfd_fake_driver.connect()
+
+        with pytest.raises(RuntimeError, match=r"pfd_fake_driver\.connect"):
+            connect()
+    finally:
+        module._optional_targets.cache_clear()
+        sys.modules.pop("pfd_fake_driver", None)
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import dataclasses
+import importlib
+from collections import OrderedDict
+from types import MappingProxyType
 from typing import TYPE_CHECKING
 
 import pytest
@@ -72,6 +75,22 @@ def test_detects_attribute_mutation() -> None:
     assert "arg[0]/.__dict__/['value']" in str(ei.value)
 
 
+@dataclasses.dataclass(slots=True)
+class SlottedBox:
+    items: list[int]
+    label: str = "box"
+
+
+def test_slotted_dataclass_fields_diffed() -> None:
+    @immutable_arguments
+    def fill(box: SlottedBox) -> None:
+        box.items.append(1)
+
+    with pytest.raises(RuntimeError) as ei:
+        fill(SlottedBox([]))
+    assert "arg[0]/.items/<len>" in str(ei.value)
+
+
 def test_warn_only_logs(caplog: pytest.LogCaptureFixture) -> None:
     caplog.set_level("WARNING")
 
@@ -137,3 +156,387 @@ def test_enabled_false_disables_checks() -> None:
 
     assert payload == [1, 2, 7]
     assert result is payload
+
+
+def test_unpicklable_arguments_fall_back_to_deepcopy() -> None:
+    class Local:
+        def __init__(self) -> None:
+            self.items: list[int] = []
+
+    @immutable_arguments
+    def mutate(obj: Local) -> None:
+        obj.items.append(1)
+
+    original = Local()
+    with pytest.raises(RuntimeError) as ei:
+        mutate(original)
+    assert "arg[0]/.__dict__/['items']/<len>" in str(ei.value)
+    assert original.items == []
+
+
+def test_unpicklable_copies_keep_aliasing_and_cycles() -> None:
+    class Local:
+        pass
+
+    shared: list[object] = [Local()]
+    cyclic: list[object] = [shared]
+    cyclic.append((cyclic, 1))
+    seen: list[list[object]] = []
+
+    @immutable_arguments
+    def inspect(data: list[object], *, again: dict[str, list[object]]) -> None:
+        seen.append(data)
+        assert data[0] is again["shared"]
+        assert data[1][0] is data  # type: ignore[index]
+        assert data[0] is not shared
+
+    inspect(cyclic, again={"shared": shared})
+    assert seen[0] is not cyclic
+
+
+def test_unpicklable_copies_share_atomic_subtrees() -> None:
+    class Local:
+        pass
+
+    frozen = frozenset({1, 2})
+    pair = ("a", 1)
+    seen: list[list[object]] = []
+
+    @immutable_arguments
+    def inspect(data: list[object]) -> None:
+        seen.append(data)
+
+    original: list[object] = [Local(), frozen, pair]
+    inspect(original)
+    assert seen[0] is not original
+    assert seen[0][1] is frozen
+    assert seen[0][2] is pair
+
+
+def test_atomic_arguments_passed_through() -> None:
+    key = ("a", (1, 2.5), frozenset({b"x"}))
+
+    @immutable_arguments
+    def identity(value: object, *, other: object) -> tuple[object, object]:
+        return value, other
+
+    value, other = identity(key, other=None)
+    assert value is key
+    assert other is None
+
+
+def test_mixed_arguments_only_copy_mutable_values() -> None:
+    label = "numbers"
+
+    @immutable_arguments
+    def mutate(name: str, data: list[int], *, scale: int) -> str:
+        data.append(scale)
+        return name
+
+    with pytest.raises(RuntimeError) as ei:
+        mutate(label, [1], scale=2)
+    assert "arg[1]/<len>" in str(ei.value)
+
+
+def test_deeply_nested_arguments_do_not_recurse() -> None:
+    nested: list[object] = []
+    for _ in range(800):
+        nested = [nested]
+
+    @immutable_arguments
+    def read_only(data: list[object]) -> int:
+        return len(data)
+
+    assert read_only(nested) == 1
+
+
+def test_cyclic_arguments_are_compared() -> None:
+    cyclic: list[object] = [1]
+    cyclic.append(cyclic)
+
+    @immutable_arguments
+    def mutate(data: list[object]) -> None:
+        data[0] = 2
+
+    with pytest.raises(RuntimeError) as ei:
+        mutate(cyclic)
+    assert "arg[0]/[0]: value 2 -> 1" in str(ei.value)
+
+
+def test_mutation_making_arguments_unpicklable_detected() -> None:
+    @immutable_arguments
+    def mutate(callbacks: list[object]) -> None:
+        callbacks.append(lambda: None)
+
+    with pytest.raises(RuntimeError) as ei:
+        mutate([])
+    assert "arg[0]/<len>: 1 -> 0" in str(ei.value)
+
+
+def test_dict_key_changes_reported() -> None:
+    @immutable_arguments
+    def rename(data: dict[str, int]) -> None:
+        data["b"] = data.pop("a")
+
+    with pytest.raises(RuntimeError) as ei:
+        rename({"a": 1})
+    assert "arg[0]/<dict-keys>" in str(ei.value)
+
+    @immutable_arguments
+    def extend(data: dict[str, int]) -> None:
+        data["b"] = 2
+
+    with pytest.raises(RuntimeError) as ei:
+        extend({"a": 1})
+    assert "arg[0]/<dict-keys>" in str(ei.value)
+    assert "['b']" in str(ei.value)
+
+
+def test_diff_false_reports_fingerprint_change(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    @immutable_arguments(diff=False)
+    def mutate(data: list[int]) -> None:
+        data.append(1)
+
+    with pytest.raises(RuntimeError) as ei:
+        mutate([])
+    assert "Argument mutated (fingerprint changed)" in str(ei.value)
+
+    @immutable_arguments(diff=False, warn_only=True)
+    def read(data: list[int]) -> int:
+        return len(data)
+
+    assert read([1, 2]) == 2
+
+    @immutable_arguments(diff=False, warn_only=True)
+    def relaxed(data: list[int]) -> None:
+        data.append(1)
+
+    caplog.set_level("WARNING")
+    relaxed([])
+    assert any("fingerprint changed" in message for message in caplog.messages)
+
+
+def test_diff_false_accepts_unmutated_sets() -> None:
+    # Large sets mixing strings and colliding integers are rebuilt in a
+    # different iteration order when copied.
+    @immutable_arguments(diff=False)
+    def size(items: list[set[object] | frozenset[object]]) -> int:
+        return sum(len(item) for item in items)
+
+    values: set[object] = {f"k{i}" for i in range(50)} | {i * 8 for i in range(50)}
+    assert size([values, frozenset(values)]) == 200
+
+
+def test_container_subclasses_compared_like_their_base() -> None:
+    @immutable_arguments
+    def mutate(data: OrderedDict[str, list[int]]) -> None:
+        data["numbers"].append(4)
+
+    with pytest.raises(RuntimeError) as ei:
+        mutate(OrderedDict(numbers=[1]))
+    assert "arg[0]/['numbers']/<len>" in str(ei.value)
+
+
+class Tracked:
+    __slots__ = ("value",)
+    reprs = 0
+
+    def __init__(self, value: int) -> None:
+        self.value = value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Tracked) and other.value == self.value
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        Tracked.reprs += 1
+        return f"Tracked({self.value})"
+
+
+def test_messages_only_built_when_reported(caplog: pytest.LogCaptureFixture) -> None:
+    def bump(obj: Tracked) -> None:
+        obj.value += 1
+
+    caplog.set_level("ERROR")
+    Tracked.reprs = 0
+    immutable_arguments(bump, warn_only=True)(Tracked(1))
+    assert Tracked.reprs == 0
+
+    with pytest.raises(RuntimeError) as ei:
+        immutable_arguments(bump)(Tracked(1))
+    assert "arg[0]: value Tracked(2) -> Tracked(1)" in str(ei.value)
+
+
+def test_type_changes_reported() -> None:
+    @immutable_arguments
+    def stringify(data: list[object]) -> None:
+        data[0] = str(data[0])
+
+    with pytest.raises(RuntimeError) as ei:
+        stringify([1])
+    assert "arg[0]/[0]: type str -> int" in str(ei.value)
+
+
+class Tagged(Tracked):
+    """Subclass of a slotted class that regains an instance ``__dict__``."""
+
+
+def test_slotted_subclass_attributes_diffed() -> None:
+    @immutable_arguments
+    def tag(obj: Tagged) -> None:
+        obj.label = "x"  # type: ignore[attr-defined]
+
+    with pytest.raises(RuntimeError) as ei:
+        tag(Tagged(1))
+    assert "arg[0]/.__dict__" in str(ei.value)
+
+
+def test_readonly_prevents_mutation() -> None:
+    seen: list[object] = []
+
+    @immutable_arguments(readonly=True)
+    def inspect(data: dict[str, object], tags: set[str]) -> None:
+        seen.extend((data, data["items"], tags))
+        data["extra"] = 1
+
+    with pytest.raises(TypeError):
+        inspect({"items": [1, {"nested": [2]}]}, tags={"a"})
+    mapping, items, tags = seen
+    assert isinstance(mapping, MappingProxyType)
+    assert items == (1, MappingProxyType({"nested": (2,)}))
+    assert tags == frozenset({"a"})
+
+    @immutable_arguments(readonly=True)
+    def append(data: list[int]) -> None:
+        data.append(1)
+
+    with pytest.raises(AttributeError):
+        append([0])
+
+
+def test_readonly_falls_back_to_detection() -> None:
+    cyclic: list[object] = []
+    cyclic.append(cyclic)
+
+    @immutable_arguments(readonly=True)
+    def mutate(box: Box, *, data: list[object], other: list[object]) -> int:
+        box.value += 1
+        return len(data) + len(other)
+
+    with pytest.raises(RuntimeError) as ei:
+        mutate(Box(1), data=[{"box": Box(2)}, {1, 2}], other=cyclic)
+    assert "arg[0]/.__dict__/['value']" in str(ei.value)
+
+    @immutable_arguments(readonly=True)
+    def count(data: dict[object, int], *, other: list[int]) -> int:
+        return len(data) + len(other)
+
+    assert count({(1, 2): 1}, other=[1]) == 2
+    assert count({Box: 1}, other=[1]) == 2
+
+
+def test_sampling_checks_one_call_in_n_after_warmup() -> None:
+    @immutable_arguments(sample_every=3, sampling_warmup=2)
+    def maybe_mutate(data: list[int], *, mutate: bool, fail: bool = False) -> None:
+        if fail:
+            raise KeyError
+        if mutate:
+            data.append(1)
+
+    maybe_mutate([], mutate=False)
+    maybe_mutate([], mutate=False)
+    maybe_mutate([], mutate=True)  # unchecked
+    maybe_mutate([], mutate=True)  # unchecked
+    with pytest.raises(RuntimeError):
+        maybe_mutate([], mutate=True)
+    with pytest.raises(RuntimeError):
+        maybe_mutate([], mutate=True)
+
+    maybe_mutate([], mutate=False)
+    maybe_mutate([], mutate=False)
+    with pytest.raises(KeyError):
+        maybe_mutate([], mutate=False, fail=True)  # unchecked
+    with pytest.raises(RuntimeError):
+        maybe_mutate([], mutate=True)
+
+
+def test_sampling_arguments_are_validated() -> None:
+    with pytest.raises(ValueError, match="sample_every"):
+        immutable_arguments(sample_every=0)
+    with pytest.raises(ValueError, match="sampling_warmup"):
+        immutable_arguments(sample_every=2, sampling_warmup=-1)
+
+
+def test_shared_arguments_report_every_mutated_argument(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    caplog.set_level("WARNING")
+    shared = {"items": [1], "other": [2]}
+    clean = [3]
+
+    @immutable_arguments(warn_only=True)
+    def mutate(
+        first: dict[str, list[int]],
+        second: dict[str, list[int]],
+        third: list[int],
+        fourth: list[int],
+    ) -> bool:
+        first["items"].append(2)
+        return first is second and third is fourth
+
+    assert mutate(shared, shared, clean, clean) is True
+    messages = [m for m in caplog.messages if "Argument mutated" in m]
+    assert messages == [
+        "Argument mutated at arg[0]/['items']/<len>: 2 -> 1",
+        "Argument mutated at arg[1]/['items']/<len>: 2 -> 1",
+    ]
+    assert shared == {"items": [1], "other": [2]}
+
+
+def test_first_diff_only_remembers_unchanged_pairs() -> None:
+    module = importlib.import_module("pure_function_decorators.immutable_arguments")
+    inner = [1]
+    copy = [1]
+    seen: set[tuple[int, int]] = set()
+    assert module._first_diff([inner, [2]], [copy, [3]], seen=seen) is not None
+    assert seen == set()
+    assert module._first_diff([inner], [copy], seen=seen) is None
+    assert (id(inner), id(copy)) in seen
+
+
+def test_in_place_detects_mutation_of_the_callers_objects(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    caplog.set_level("WARNING")
+    values = [1, 2]
+    received: list[object] = []
+
+    @immutable_arguments(in_place=True)
+    def append(items: list[int], *, extra: dict[str, int]) -> None:
+        received.extend([items, extra])
+        items.append(3)
+
+    extra = {"a": 1}
+    with pytest.raises(RuntimeError, match=r"arg\[0\]"):
+        append(values, extra=extra)
+    assert received[0] is values
+    assert received[1] is extra
+    assert values == [1, 2, 3]
+
+    @immutable_arguments(in_place=True, warn_only=True)
+    def pop(items: list[object]) -> object:
+        return items.pop()
+
+    unpicklable = [1, lambda: None]
+    assert callable(pop(unpicklable))
+    assert unpicklable == [1]
+    assert any("Argument mutated at arg[0]" in m for m in caplog.messages)
+
+    @immutable_arguments(in_place=True, diff=False)
+    def read(items: list[int]) -> int:
+        return len(items)
+
+    assert read(values) == 3
@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pure_function_decorators
+import pytest
+
+
+def test_decorators_are_imported_lazily() -> None:
+    code = (
+        "import sys\n"
+        "from pure_function_decorators import immutable_arguments\n"
+        "assert callable(immutable_arguments)\n"
+        "assert 'pure_function_decorators.enforce_deterministic' not in sys.modules\n"
+        "assert 'asyncio' not in sys.modules\n"
+    )
+    source_root = Path(pure_function_decorators.__file__).parent.parent
+    env = {**os.environ, "PYTHONPATH": str(source_root)}
+    subprocess.run([sys.executable, "-c", code], check=True, env=env)
+
+
+def test_public_names_resolve_to_decorators() -> None:
+    for name in pure_function_decorators.__all__:
+        decorator = getattr(pure_function_decorators, name)
+        assert callable(decorator)
+        assert decorator.__name__ == name
+        assert name in dir(pure_function_decorators)
+
+    with pytest.raises(AttributeError):
+        _ = pure_function_decorators.missing
+
+
+def test_environment_switch_disables_every_decorator() -> None:
+    code = (
+        "import pure_function_decorators as pfd\n"
+        "def target():\n"
+        "    return 0\n"
+        "for name in pfd.__all__:\n"
+        "    assert getattr(pfd, name)(target) is target, name\n"
+    )
+    source_root = Path(pure_function_decorators.__file__).parent.parent
+    env = {**os.environ, "PYTHONPATH": str(source_root), "PURE_FN_ENFORCE": "0"}
+    subprocess.run([sys.executable, "-c", code], check=True, env=env)
+
+
+def test_decorators_stay_bound_after_importing_their_submodules() -> None:
+    code = (
+        "import importlib\n"
+        "import types\n"
+        "import pure_function_decorators.immutable_arguments\n"
+        "importlib.import_module('pure_function_decorators.forbid_side_effects')\n"
+        "from pure_function_decorators import forbid_side_effects\n"
+        "from pure_function_decorators import immutable_arguments\n"
+        "from pure_function_decorators.immutable_arguments import _first_diff\n"
+        "assert not isinstance(immutable_arguments, types.ModuleType)\n"
+        "assert not isinstance(forbid_side_effects, types.ModuleType)\n"
+        "assert immutable_arguments.__name__ == 'immutable_arguments'\n"
+        "assert callable(_first_diff)\n"
+    )
+    source_root = Path(pure_function_decorators.__file__).parent.parent
+    env = {**os.environ, "PYTHONPATH": str(source_root)}
+    subprocess.run([sys.executable, "-c", code], check=True, env=env)
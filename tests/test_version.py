@@ -1,3 +1,4 @@
+import importlib
 from importlib.metadata import PackageNotFoundError
 from unittest import mock
 
@@ -77,3 +78,12 @@ def test_get_version__returns_unknown_if_both_fail() -> None:
 
         mocked_metadata.assert_called_once()
         mocked_pyproject.assert_called_once()
+
+
+def test_version_resolved_on_first_access(monkeypatch: pytest.MonkeyPatch) -> None:
+    module = importlib.import_module("pure_function_decorators.version")
+    monkeypatch.delattr(module, "__version__", raising=False)
+    importlib.reload(module)
+    assert "__version__" not in vars(module)
+    assert module.__version__ == __version__
+    assert "__version__" in vars(module)